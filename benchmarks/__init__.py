@@ -0,0 +1,15 @@
+"""
+API sıcak yolları için benchmark ve yük testi paketi.
+
+Ayrı bir test veritabanına sentetik kiracılar yazar, DRF uç noktalarını
+süreç içinde (APIClient, JWT ile) çağırır ve her uç nokta için gecikme
+yüzdeliklerini, sorgu sayısını ve bellek ayrımını raporlar.
+
+    python -m benchmarks --scale 5
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json   # gerilemede çıkış kodu 1
+    DATABASE_URL=postgres://localhost/dashboard python -m benchmarks
+
+Süreler makineye bağlıdır; taban çizgisi aynı makinede üretilmelidir.
+Sorgu sayısı karşılaştırması ise makineden bağımsızdır.
+"""
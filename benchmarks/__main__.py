@@ -0,0 +1,70 @@
+import argparse
+import os
+import platform
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="API uç noktalarını sentetik veriyle süreç içinde ölçer.",
+    )
+    parser.add_argument('--scale', type=int, default=1, help="Kiracı başına veri çarpanı")
+    parser.add_argument('--tenants', type=int, default=2)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO', help="Sadece bu senaryolar")
+    parser.add_argument('--baseline', help="Karşılaştırılacak taban çizgisi (JSON)")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Sonuçları taban çizgisi olarak yaz")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="İzin verilen artış oranı")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dashboard_project.settings')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+
+    from . import runner
+    from .scenarios import SCENARIOS, build_context
+    from .seed import Scale, seed
+
+    scenarios = SCENARIOS
+    if args.only:
+        unknown = set(args.only) - {scenario.name for scenario in SCENARIOS}
+        if unknown:
+            parser.error(f"bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in args.only]
+
+    scale = Scale(tenants=args.tenants).scaled(args.scale)
+
+    with runner.benchmark_database():
+        users = seed(scale)
+        ctx = build_context(users[0])
+        results = runner.run(scenarios, ctx, args.iterations, args.warmup)
+
+    print(f"{connection.vendor}, {scale}")
+    print(runner.format_table(results))
+
+    if args.save_baseline:
+        runner.save_baseline(args.save_baseline, results, {
+            'database': connection.vendor,
+            'scale': vars(scale),
+            'iterations': args.iterations,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'fast_json': getattr(settings, 'API_FAST_JSON', False),
+        })
+
+    if args.baseline:
+        regressions = runner.compare(results, runner.load_baseline(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"GERİLEME {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
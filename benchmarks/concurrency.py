@@ -0,0 +1,107 @@
+"""
+WSGI ve ASGI okuma yollarının worker başına eşzamanlı throughput karşılaştırması.
+
+Her sorguya `--latency-ms` kadar yapay gecikme eklenir (ağ üzerinden
+PostgreSQL gidiş-dönüşü). Karşılaştırılanlar:
+
+- wsgi: senkron gunicorn worker'ı gibi istekler tek tek işlenir
+- asgi-sync: ASGI altında mevcut senkron viewset'ler
+- asgi-async: /api/async/ uç noktaları
+
+    python -m benchmarks.concurrency --latency-ms 5 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.concurrency')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="Sorgu başına gecikme")
+    parser.add_argument('--concurrency', type=int, default=32, help="ASGI'de eşzamanlı istek")
+    parser.add_argument('--requests', type=int, default=200, help="Uç nokta başına istek")
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dashboard_project.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import AsyncClient, Client
+    from django.test.utils import override_settings
+
+    from . import runner
+    from .scenarios import build_context
+    from .seed import Scale, seed
+
+    latency = args.latency_ms / 1000
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def add_latency(sender, connection, **kwargs):
+        if slow_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_query)
+
+    # Yanıt önbelleği kapatılır; her istek veritabanına gider
+    dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    with runner.benchmark_database(), override_settings(CACHES=dummy_cache):
+        users = seed(Scale(tenants=2).scaled(args.scale))
+        ctx = build_context(users[0])
+        headers = {'Authorization': ctx.client._credentials['HTTP_AUTHORIZATION']}
+        endpoints = [
+            ('order_list', '/api/orders/', '/api/async/orders/'),
+            ('order_retrieve', f'/api/orders/{ctx.order_id}/', f'/api/async/orders/{ctx.order_id}/'),
+            ('product_list', '/api/products/', '/api/async/products/'),
+            ('company_list', '/api/companies/', '/api/async/companies/'),
+        ]
+
+        connection_created.connect(add_latency)
+        add_latency(None, connection)
+        results = []
+        for name, sync_path, async_path in endpoints:
+            results.append((name, 'wsgi', _wsgi(Client(headers=headers), sync_path, args.requests)))
+            for mode, path in (('asgi-sync', sync_path), ('asgi-async', async_path)):
+                results.append((name, mode, asyncio.run(_asgi(
+                    AsyncClient(), path, headers, args.requests, args.concurrency
+                ))))
+        connection_created.disconnect(add_latency)
+
+    print(
+        f"{connection.vendor}, sorgu gecikmesi {args.latency_ms} ms, "
+        f"ASGI eşzamanlılık {args.concurrency}"
+    )
+    print(f"{'endpoint':<15} {'mode':<11} {'req/s':>8}")
+    for name, mode, rate in results:
+        print(f"{name:<15} {mode:<11} {rate:>8.1f}")
+    return 0
+
+
+def _wsgi(client, path, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+    return count / (time.perf_counter() - start)
+
+
+async def _asgi(client, path, headers, count, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path, headers=headers)
+            assert response.status_code == 200, (path, response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
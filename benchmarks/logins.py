@@ -0,0 +1,83 @@
+"""
+Hasher başına giriş (POST /api/token/) throughput'u.
+
+Her hasher için önce tek thread'de, sonra CPU sayısı kadar eşzamanlı
+istemciyle ölçülür; sonuç çekirdek başına saniyedeki giriş sayısıdır.
+Kütüphanesi kurulu olmayan hasher'lar (argon2-cffi, bcrypt) atlanır.
+
+    python -m benchmarks.logins --hashers pbkdf2 argon2 bcrypt --requests 40
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.logins')
+    parser.add_argument(
+        '--hashers', nargs='+', default=['pbkdf2', 'argon2', 'bcrypt', 'scrypt'],
+    )
+    parser.add_argument('--requests', type=int, default=40, help="Ölçüm başına giriş")
+    parser.add_argument('--concurrency', type=int, default=0, help="Varsayılan: CPU sayısı")
+    parser.add_argument('--hash-threads', type=int, default=0, help="PASSWORD_HASH_THREADS")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dashboard_project.settings')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import get_hasher
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from dashboard_project.server import available_cpus
+    from . import runner
+    from .seed import PASSWORD
+
+    cpus = available_cpus()
+    concurrency = args.concurrency or cpus
+    results = []
+    with runner.benchmark_database():
+        for name in args.hashers:
+            hashers = [path for path in settings.PASSWORD_HASHERS if name in path.lower()]
+            with override_settings(
+                PASSWORD_HASHERS=hashers, PASSWORD_HASH_THREADS=args.hash_threads,
+            ):
+                try:
+                    get_hasher().encode(PASSWORD, get_hasher().salt())
+                except ValueError as exc:
+                    print(f"{name}: atlandı ({exc})", file=sys.stderr)
+                    continue
+                user = get_user_model().objects.create_user(
+                    username=f'login-{name}', password=PASSWORD
+                )
+                credentials = {'username': user.username, 'password': PASSWORD}
+
+                def login(_):
+                    response = Client().post('/api/token/', credentials)
+                    assert response.status_code == 200, response.status_code
+
+                single = _rate(login, args.requests, 1)
+                parallel = _rate(login, args.requests, concurrency)
+                results.append((name, single, parallel, parallel / min(concurrency, cpus)))
+
+    print(f"{cpus} CPU, {concurrency} eşzamanlı istemci, hash thread: {args.hash_threads}")
+    print(f"{'hasher':<8} {'1 thread/s':>11} {'paralel/s':>10} {'çekirdek/s':>11}")
+    for name, single, parallel, per_core in results:
+        print(f"{name:<8} {single:>11.1f} {parallel:>10.1f} {per_core:>11.1f}")
+    return 0
+
+
+def _rate(func, count, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(func, range(count)))
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Senaryoları ölçme ve taban çizgisiyle karşılaştırma"""
+import gc
+import json
+import math
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Ayrı bir test veritabanı kur (SQLite veya DATABASE_URL ile PostgreSQL);
+    gerçek veriye dokunulmaz.
+    """
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        # Tek süreç: yerel önbellekte de geçersiz kılma doğru çalışır
+        with override_settings(SECURE_SSL_REDIRECT=False, API_CACHE_TIMEOUT=300):
+            yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    """En yakın sıra yöntemiyle yüzdelik (örnekler sıralı olmalı)"""
+    rank = max(math.ceil(pct / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+def measure(scenario, ctx, iterations=50, warmup=5):
+    """
+    Tek senaryoyu ölç.
+
+    Süreler izleme olmadan ölçülür; sorgu sayısı ve bellek ayrımı
+    (tracemalloc) ek bir istekte ayrıca alınır, böylece süreleri bozmaz.
+    """
+    if scenario.max_iterations:
+        iterations = min(iterations, scenario.max_iterations)
+        warmup = min(warmup, 1)
+
+    for _ in range(warmup):
+        if scenario.setup:
+            scenario.setup(ctx)
+        scenario.request(ctx)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            if scenario.setup:
+                scenario.setup(ctx)
+            start = time.perf_counter()
+            scenario.request(ctx)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    samples.sort()
+
+    if scenario.setup:
+        scenario.setup(ctx)
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            scenario.request(ctx)
+        allocated, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'queries': len(queries),
+        'peak_kib': round(peak / 1024, 1),
+        'retained_kib': round(allocated / 1024, 1),
+    }
+
+
+def run(scenarios, ctx, iterations=50, warmup=5):
+    return {
+        scenario.name: measure(scenario, ctx, iterations, warmup)
+        for scenario in scenarios
+    }
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Taban çizgisine göre gerilemeleri listele.
+
+    p50 / p95 süresi veya tepe bellek `tolerance` oranından fazla artmışsa,
+    sorgu sayısı ise herhangi bir artışta gerileme sayılır.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(
+                f"{name}: sorgu sayısı {previous['queries']} -> {current['queries']}"
+            )
+        for key in ('p50_ms', 'p95_ms', 'peak_kib'):
+            if current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+
+def save_baseline(path, results, meta):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'meta': meta, 'results': results}, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def format_table(results):
+    columns = ['p50_ms', 'p95_ms', 'p99_ms', 'mean_ms', 'queries', 'peak_kib']
+    width = max(len(name) for name in results)
+    lines = [f"{'endpoint':<{width}}  " + '  '.join(f'{column:>9}' for column in columns)]
+    for name, result in results.items():
+        lines.append(
+            f"{name:<{width}}  " + '  '.join(f'{result[column]:>9}' for column in columns)
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,122 @@
+"""Ölçülen uç noktalar"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from order.models import Order
+from product.models import Product
+from users.tokens import RefreshToken
+from .seed import PASSWORD
+
+
+@dataclass
+class Context:
+    """Senaryoların paylaştığı kiracı ve JWT ile kimliği doğrulanmış istemci"""
+    user: object
+    client: APIClient
+    anonymous: APIClient
+    order_id: int
+    company_id: int
+    product_ids: list
+    refresh: str = ''
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[Context], str]
+    data: Optional[Callable[[Context], dict]] = None
+    # Zamanlamaya dahil edilmeyen, her iterasyondan önce çalışan hazırlık
+    setup: Optional[Callable[[Context], None]] = None
+    # Pahalı senaryolarda (ör. parola hash'i) iterasyon üst sınırı
+    max_iterations: Optional[int] = None
+    expected_status: int = 200
+    authenticated: bool = True
+
+    def request(self, ctx):
+        client = ctx.client if self.authenticated else ctx.anonymous
+        if self.method == 'get':
+            response = client.get(self.path(ctx))
+        else:
+            response = getattr(client, self.method)(self.path(ctx), self.data(ctx), format='json')
+        if response.status_code != self.expected_status:
+            raise AssertionError(
+                f"{self.name}: beklenen {self.expected_status}, gelen {response.status_code}"
+            )
+        # Akış yanıtları dahil gövdenin tamamı üretilsin
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+
+def build_context(user):
+    client = APIClient()
+    response = client.post(
+        '/api/token/', {'username': user.username, 'password': PASSWORD}, format='json'
+    )
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    order = Order.objects.filter(owner=user).order_by('-created_at', 'id').first()
+    return Context(
+        user=user,
+        client=client,
+        anonymous=APIClient(),
+        order_id=order.pk,
+        company_id=order.company_id,
+        product_ids=list(
+            Product.objects.filter(owner=user).order_by('id').values_list('id', flat=True)[:5]
+        ),
+    )
+
+
+def _order_payload(ctx):
+    return {
+        'company': ctx.company_id,
+        'global_discount': '5.00',
+        'vat_rate': '20.00',
+        'items': [
+            {'product': product_id, 'quantity': 2, 'unit_price': '10.00'}
+            for product_id in ctx.product_ids
+        ],
+    }
+
+
+def _clear_cache(ctx):
+    cache.clear()
+
+
+def _new_refresh_token(ctx):
+    # Döndürülen token kara listeye girer; her iterasyon yeni bir token kullanır
+    ctx.refresh = str(RefreshToken.for_user(ctx.user))
+
+
+SCENARIOS = [
+    Scenario('order_list', 'get', lambda ctx: '/api/orders/'),
+    Scenario('order_list_expand', 'get', lambda ctx: '/api/orders/?expand=items'),
+    Scenario('order_list_filtered', 'get', lambda ctx: '/api/orders/?ordering=-total&total_min=100'),
+    Scenario('order_retrieve', 'get', lambda ctx: f'/api/orders/{ctx.order_id}/'),
+    Scenario(
+        'order_create', 'post', lambda ctx: '/api/orders/', data=_order_payload,
+        expected_status=201,
+    ),
+    Scenario('product_list', 'get', lambda ctx: '/api/products/'),
+    Scenario(
+        'product_list_uncached', 'get', lambda ctx: '/api/products/', setup=_clear_cache,
+    ),
+    Scenario('product_search', 'get', lambda ctx: '/api/products/?search=urun%201', setup=_clear_cache),
+    Scenario('company_list', 'get', lambda ctx: '/api/companies/', setup=_clear_cache),
+    Scenario('dashboard_summary', 'get', lambda ctx: '/api/dashboard/summary/'),
+    Scenario('order_export_csv', 'get', lambda ctx: '/api/orders/export/?type=csv'),
+    Scenario(
+        'token_obtain', 'post', lambda ctx: '/api/token/',
+        data=lambda ctx: {'username': ctx.user.username, 'password': PASSWORD},
+        authenticated=False, max_iterations=10,
+    ),
+    Scenario(
+        'token_refresh', 'post', lambda ctx: '/api/token/refresh/',
+        data=lambda ctx: {'refresh': ctx.refresh}, setup=_new_refresh_token,
+        authenticated=False,
+    ),
+]
@@ -0,0 +1,90 @@
+"""Benchmark için sentetik kiracı (kullanıcı) verisi"""
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from company.models import Company
+from order.models import Order, OrderItem
+from order.pricing import recalculate_in_db
+from order.rollup import rebuild_rollup
+from product.models import Product
+
+PASSWORD = 'Bench-Secret123!'
+
+
+@dataclass(frozen=True)
+class Scale:
+    tenants: int = 2
+    companies: int = 20
+    products: int = 100
+    orders: int = 200
+    items: int = 5
+
+    def scaled(self, factor):
+        """Kiracı sayısı sabit, kiracı başına veri `factor` katı"""
+        return Scale(
+            tenants=self.tenants,
+            companies=self.companies * factor,
+            products=self.products * factor,
+            orders=self.orders * factor,
+            items=self.items,
+        )
+
+
+@transaction.atomic
+def seed(scale, seed=0):
+    """
+    Her kiracı için şirket, ürün ve kalemli sipariş üretir.
+
+    Tüm kayıtlar bulk_create ile yazılır; tutarlar ve satış özeti ardından
+    veritabanında topluca hesaplanır. Oluşturulan kullanıcıları döndürür.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    # Parola bir kez hash'lenir; kiracı başına PBKDF2 maliyeti ödenmez
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create([
+        User(username=f'bench-{i}', password=password) for i in range(scale.tenants)
+    ])
+
+    for user in users:
+        companies = [
+            Company(name=f'Şirket {user.pk}-{i}', owner=user) for i in range(scale.companies)
+        ]
+        products = [
+            Product(
+                code=f'B{user.pk}-{i:06d}', name=f'Ürün {i}',
+                price=Decimal(rng.randint(100, 100000)) / 100, owner=user,
+            )
+            for i in range(scale.products)
+        ]
+        for obj in (*companies, *products):
+            obj.refresh_search_text()
+        Company.objects.bulk_create(companies)
+        Product.objects.bulk_create(products)
+
+        orders = Order.objects.bulk_create([
+            Order(
+                company=rng.choice(companies), owner=user,
+                delivery_date=date.today() + timedelta(days=rng.randint(0, 30)),
+                global_discount=Decimal(rng.choice([0, 5, 10])),
+            )
+            for _ in range(scale.orders)
+        ])
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order, product=product, quantity=rng.randint(1, 20),
+                unit_price=product.price, item_discount=Decimal(rng.choice([0, 0, 5])),
+            )
+            for order in orders
+            for product in rng.sample(products, min(scale.items, len(products)))
+        ], batch_size=1000)
+
+        recalculate_in_db(Order.objects.filter(owner=user))
+        rebuild_rollup(user.pk)
+    return users
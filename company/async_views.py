@@ -0,0 +1,12 @@
+from dashboard_project.async_api import AsyncReadView
+from dashboard_project.filters import SearchQuerySerializer
+from .models import Company
+from .serializers import CompanySerializer
+
+
+class CompanyAsyncView(AsyncReadView):
+    serializer_class = CompanySerializer
+    filter_serializer_class = SearchQuerySerializer
+
+    def get_queryset(self, user):
+        return Company.objects.filter(owner=user)
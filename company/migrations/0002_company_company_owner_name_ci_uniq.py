@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:07
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='company',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), models.F('owner'), name='company_owner_name_ci_uniq'),
+        ),
+    ]
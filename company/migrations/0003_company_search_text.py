@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:19
+
+from django.db import migrations, models
+
+from dashboard_project.search import normalize_search
+
+
+def fill_search_text(apps, schema_editor):
+    Company = apps.get_model('company', 'Company')
+    # Tablo belleğe tek seferde alınmaz; parça parça okunup yazılır
+    batch = []
+    for row in Company.objects.only('pk', 'name').iterator(chunk_size=1000):
+        row.search_text = normalize_search(row.name)
+        batch.append(row)
+        if len(batch) >= 1000:
+            Company.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    Company.objects.bulk_update(batch, ['search_text'])
+
+
+def create_trigram_index(apps, schema_editor):
+    # Sadece PostgreSQL: LIKE '%...%' aramaları için pg_trgm GIN indeksi
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS company_search_trgm_idx "
+        "ON company_company USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS company_search_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_company_company_owner_name_ci_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
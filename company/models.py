@@ -1,10 +1,30 @@
 from django.db import models
 from django.conf import settings
+from django.db.models.functions import Lower
+from dashboard_project.search import normalize_search
 
 class Company(models.Model):
     name = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='companies')
+    # Büyük/küçük harf ve aksan duyarsız arama için (bkz. normalize_search)
+    search_text = models.CharField(max_length=255, blank=True, default='', editable=False)
+
+    class Meta:
+        constraints = [
+            # Aynı kullanıcıda büyük/küçük harf duyarsız benzersiz şirket ismi
+            models.UniqueConstraint(Lower('name'), 'owner', name='company_owner_name_ci_uniq'),
+        ]
 
     def __str__(self):
         return self.name
+
+    def refresh_search_text(self):
+        self.search_text = normalize_search(self.name)
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
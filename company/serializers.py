@@ -1,7 +1,12 @@
 from rest_framework import serializers
+from django.db.models import Value
+from django.db.models.functions import Lower
+from dashboard_project.serializers import IntegrityErrorMixin
 from .models import Company
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(IntegrityErrorMixin, serializers.ModelSerializer):
+    integrity_error = {'name': ["Bu isimde bir şirket zaten kayıtlı."]}
+
     class Meta:
         model = Company
         fields = ['id', 'name', 'created_at', 'owner']
@@ -23,9 +28,10 @@ class CompanySerializer(serializers.ModelSerializer):
         
         # Aynı kullanıcının aynı isimle başka şirket olup olmadığı
         user = self.context['request'].user
-        existing = Company.objects.filter(
+        # Lower(name) fonksiyonel indeksini kullanacak şekilde karşılaştır
+        existing = Company.objects.alias(name_lower=Lower('name')).filter(
             owner=user,
-            name__iexact=value.strip()
+            name_lower=Lower(Value(value.strip()))
         )
         
         # Update işleminde mevcut kaydı hariç tut
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dashboard_project.cache import invalidate_cached_responses
+from .models import Company
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_responses(sender, instance, **kwargs):
+    """Önbellekteki liste ve detay yanıtlarını geçersiz kıl"""
+    invalidate_cached_responses('company', instance.owner_id, instance.pk)
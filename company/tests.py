@@ -1,3 +1,63 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .models import Company
+from .serializers import CompanySerializer
+
+User = get_user_model()
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CompanyUniqueNameTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+        Company.objects.create(name='Acme Ltd', owner=self.user)
+
+    def test_duplicate_name_is_case_insensitive(self):
+        response = self.client.post('/api/companies/', {'name': 'ACME LTD'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data)
+
+    def test_database_enforces_unique_name_per_owner(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Company.objects.create(name='acme ltd', owner=self.user)
+
+        other = User.objects.create_user(username='other', password='Secret123!')
+        Company.objects.create(name='acme ltd', owner=other)
+
+    def test_concurrent_duplicate_is_rejected_with_400(self):
+        # Serializer kontrolünü geçen eşzamanlı istek: kısıt ihlali 400 olmalı
+        with patch.object(CompanySerializer, 'validate_name', lambda self, value: value):
+            response = self.client.post('/api/companies/', {'name': 'acme ltd'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['name'], ["Bu isimde bir şirket zaten kayıtlı."])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CompanySearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+        Company.objects.create(name='İSTANBUL Çiçek', owner=self.user)
+        Company.objects.create(name='Ankara Gıda', owner=self.user)
+
+    def _names(self, search):
+        response = self.client.get('/api/companies/', {'search': search})
+        self.assertEqual(response.status_code, 200)
+        return [company['name'] for company in response.json()['results']]
+
+    def test_search_ignores_case_and_turkish_diacritics(self):
+        self.assertEqual(self._names('istanbul cicek'), ['İSTANBUL Çiçek'])
+        self.assertEqual(self._names('GIDA'), ['Ankara Gıda'])
+        self.assertEqual(len(self._names('')), 2)
+
+    def test_search_text_follows_name_changes(self):
+        company = Company.objects.get(name='Ankara Gıda')
+        company.name = 'Ankara Şeker'
+        company.save(update_fields=['name'])
+        self.assertEqual(self._names('seker'), ['Ankara Şeker'])
@@ -1,10 +1,15 @@
 from rest_framework import viewsets, permissions
+from dashboard_project.cache import CachedResponseMixin
+from dashboard_project.filters import QueryParamFilterBackend, SearchQuerySerializer
 from .models import Company
 from .serializers import CompanySerializer
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     serializer_class = CompanySerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'company'
+    filter_backends = [QueryParamFilterBackend]
+    filter_serializer_class = SearchQuerySerializer
 
     def get_queryset(self):
         # Sadece giriş yapan kullanıcının şirketleri
@@ -0,0 +1,205 @@
+"""
+ASGI altında çalışan asenkron okuma (liste / detay) uç noktaları.
+
+Django'nun async ORM metotları (`aget`, `aiterator`) sorguları asgiref'in
+tek paylaşılan sync thread'inde çalıştırır; eşzamanlı istekler yine tek
+bağlantının arkasında sıraya girer. Bu yüzden sorgular burada sınırlı bir
+thread havuzunda (ASYNC_DB_THREADS, thread başına bir bağlantı) çalıştırılır;
+kimlik doğrulama, serileştirme ve render event loop'ta kalır.
+
+Bir ASGI sunucusuyla çalıştırılır (ör. `uvicorn dashboard_project.asgi:application`);
+WSGI altında da çalışır ama eşzamanlılık kazancı olmaz.
+
+Yanıtlar senkron viewset'lerle aynı biçimdedir. Sayfalama aynı sıralama
+alanlarıyla keyset (cursor) tabanlıdır ancak yalnızca ileri yönlüdür
+(`previous` her zaman null).
+"""
+import asyncio
+import base64
+import binascii
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.db import close_old_connections
+from django.db.models import Q
+from django.http import HttpResponse
+from django.urls import path
+from django.views import View
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, NotFound
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from users.authentication import CachedJWTAuthentication
+from .pagination import DefaultCursorPagination
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix='async-db'
+        )
+    return _executor
+
+
+def _call(fn):
+    # İstek başı / sonu gibi: süresi dolmuş veya bozuk bağlantıları kapat
+    close_old_connections()
+    try:
+        return fn()
+    finally:
+        close_old_connections()
+
+
+async def run_db(fn, *args, **kwargs):
+    """`fn`'i veritabanı thread havuzunda çalıştır ve sonucunu bekle"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _call, partial(fn, *args, **kwargs))
+
+
+def _ordering(ordering):
+    return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+
+def _keyset_filter(ordering, values):
+    """Sıralamada verilen konumdan sonra gelen satırlar"""
+    conditions = []
+    for index, field in enumerate(ordering):
+        equal = {name.lstrip('-'): value for name, value in zip(ordering[:index], values)}
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        conditions.append(Q(**equal, **{f"{field.lstrip('-')}__{lookup}": values[index]}))
+    return reduce(or_, conditions)
+
+
+class AsyncReadView(View):
+    """
+    Sahibine göre filtrelenmiş bir kaynak için async liste ve detay.
+
+    Alt sınıflar `get_queryset(user)` ile serializer sınıflarını tanımlar;
+    `filter_serializer_class` senkron viewset'lerdekiyle aynıdır.
+    """
+    serializer_class = None
+    list_serializer_class = None
+    filter_serializer_class = None
+    pagination_class = DefaultCursorPagination
+    authenticator = CachedJWTAuthentication()
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+    def get_list_serializer_class(self, request):
+        return self.list_serializer_class or self.serializer_class
+
+    async def get(self, request, pk=None):
+        try:
+            user = await run_db(self._authenticate, request)
+            if pk is None:
+                data = await self.list(request, user)
+            else:
+                data = await self.retrieve(request, user, pk)
+        except APIException as exc:
+            return self._error(exc)
+        return self.render(data)
+
+    def _authenticate(self, request):
+        result = self.authenticator.authenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+        return result[0]
+
+    async def list(self, request, user):
+        queryset = self.get_queryset(user)
+        if self.filter_serializer_class is not None:
+            params = self.filter_serializer_class(data=request.GET)
+            params.is_valid(raise_exception=True)
+            queryset = params.filter_queryset(queryset)
+
+        serializer_class = self.get_list_serializer_class(request)
+        queryset = self._eager(serializer_class, queryset)
+        ordering = _ordering(self.pagination_class.ordering)
+        cursor = request.GET.get('cursor')
+        if cursor:
+            queryset = queryset.filter(self._decode_cursor(cursor, ordering, queryset.model))
+
+        page_size = self._page_size(request)
+        rows = await run_db(list, queryset.order_by(*ordering)[:page_size + 1])
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            params = request.GET.copy()
+            params['cursor'] = self._encode_cursor(rows[-1], ordering)
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        serializer = serializer_class(rows, many=True, context=self._context(request))
+        return {'next': next_url, 'previous': None, 'results': serializer.data}
+
+    async def retrieve(self, request, user, pk):
+        queryset = self._eager(self.serializer_class, self.get_queryset(user))
+        try:
+            instance = await run_db(queryset.get, pk=pk)
+        except ObjectDoesNotExist:
+            raise NotFound()
+        return self.serializer_class(instance, context=self._context(request)).data
+
+    def render(self, data, status=200):
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+    def _error(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(detail, status=exc.status_code)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            response['WWW-Authenticate'] = self.authenticator.authenticate_header(None)
+        return response
+
+    def _context(self, request):
+        # Serializer'lar yalnızca metot ve sorgu parametrelerini okur
+        return {'request': Request(request)}
+
+    def _eager(self, serializer_class, queryset):
+        setup = getattr(serializer_class, 'setup_eager_loading', None)
+        return setup(queryset) if setup else queryset
+
+    def _page_size(self, request):
+        pagination = self.pagination_class
+        try:
+            size = int(request.GET[pagination.page_size_query_param])
+        except (KeyError, ValueError):
+            return pagination.page_size
+        if size < 1:
+            return pagination.page_size
+        return min(size, pagination.max_page_size)
+
+    def _encode_cursor(self, instance, ordering):
+        values = [
+            instance._meta.get_field(field.lstrip('-')).value_to_string(instance)
+            for field in ordering
+        ]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def _decode_cursor(self, cursor, ordering, model):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, DjangoValidationError):
+            raise NotFound("Geçersiz cursor.")
+        return _keyset_filter(ordering, values)
+
+
+def resource_urls(prefix, view, basename):
+    """Senkron router ile aynı biçimde liste ve detay yolları"""
+    return [
+        path(f'{prefix}/', view.as_view(), name=f'async-{basename}-list'),
+        path(f'{prefix}/<int:pk>/', view.as_view(), name=f'async-{basename}-detail'),
+    ]
@@ -0,0 +1,138 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+
+def _state_key(resource, owner_id):
+    return f"api:{resource}:{owner_id}:state"
+
+
+def _objects_key(resource, owner_id):
+    return f"api:{resource}:{owner_id}:objects"
+
+
+def _object_key(resource, owner_id, pk):
+    return f"api:{resource}:{owner_id}:obj:{pk}"
+
+
+def _bump(key):
+    """Sürüm sayacını atomik olarak artır ve son değişiklik zamanını kaydet"""
+    cache.add(f"{key}:ver", 0, timeout=None)
+    try:
+        cache.incr(f"{key}:ver")
+    except ValueError:
+        # Anahtar add ile incr arasında düşmüşse yeniden başlat
+        cache.set(f"{key}:ver", 1, timeout=None)
+    cache.set(f"{key}:mod", int(time.time()), timeout=None)
+
+
+def _get_state(keys):
+    """Verilen sürüm anahtarlarından birleşik sürüm ve en son değişiklik zamanı"""
+    names = [f"{key}:{suffix}" for key in keys for suffix in ('ver', 'mod')]
+    values = cache.get_many(names)
+    version = '.'.join(str(values.get(f"{key}:ver", 0)) for key in keys)
+    modified = max((values[f"{key}:mod"] for key in keys if f"{key}:mod" in values), default=None)
+    return version, modified
+
+
+def invalidate_cached_responses(resource, owner_id, pk=None, all_objects=False):
+    """
+    Kullanıcının `resource` listelerini ve (verildiyse) tek kayıt yanıtını geçersiz kıl.
+
+    Toplu yazmalarda `all_objects=True` ile kullanıcının tüm detay yanıtları
+    tek seferde geçersiz kılınır.
+
+    Anahtarlar sürümlüdür; eski kayıtlar silinmez, erişilemez hale gelir ve
+    zaman aşımıyla düşer. Sürüm hem hemen hem de commit sonrasında artırılır;
+    böylece commit'ten önce okunup önbelleğe yazılmış yanıtlar da düşer.
+    """
+    keys = [_state_key(resource, owner_id)]
+    if pk is not None:
+        keys.append(_object_key(resource, owner_id, pk))
+    if all_objects:
+        keys.append(_objects_key(resource, owner_id))
+
+    def bump_all():
+        for key in keys:
+            _bump(key)
+
+    bump_all()
+    transaction.on_commit(bump_all)
+
+
+class CachedResponseMixin:
+    """
+    list / retrieve JSON yanıtlarını kullanıcı bazında önbelleğe alır.
+
+    Yanıtlara ETag ve Last-Modified eklenir; If-None-Match veya
+    If-Modified-Since eşleşirse 304 döner. Viewset `cache_resource`
+    tanımlamalı, yazma işlemleri `invalidate_cached_responses` çağırmalıdır.
+    API_CACHE_TIMEOUT 0 iken önbellek atlanır.
+    """
+    cache_resource = None
+
+    def list(self, request, *args, **kwargs):
+        state_keys = [_state_key(self.cache_resource, request.user.pk)]
+        return self._cached_response(
+            state_keys, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        state_keys = [
+            _objects_key(self.cache_resource, request.user.pk),
+            _object_key(self.cache_resource, request.user.pk, pk),
+        ]
+        return self._cached_response(
+            state_keys, super().retrieve, request, *args, **kwargs
+        )
+
+    def _cached_response(self, state_keys, view, request, *args, **kwargs):
+        # API_CACHE_TIMEOUT=0: paylaşılan önbellek yok, sürüm artışı diğer
+        # worker'lara ulaşmaz (bkz. settings.py)
+        if request.accepted_renderer.format != 'json' or settings.API_CACHE_TIMEOUT <= 0:
+            return view(request, *args, **kwargs)
+
+        version, modified = _get_state(state_keys)
+        path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        key = f"{state_keys[-1]}:v{version}:{path_hash}"
+
+        entry = cache.get(key)
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            body = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            entry = {
+                'body': body,
+                'content_type': request.accepted_media_type,
+                'etag': quote_etag(hashlib.md5(body).hexdigest()),
+                'modified': modified,
+            }
+            cache.set(key, entry, timeout=settings.API_CACHE_TIMEOUT)
+
+        if self._not_modified(request, entry):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry['body'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        if entry['modified']:
+            response['Last-Modified'] = http_date(entry['modified'])
+        # Tarayıcı/proxy her seferinde doğrulamalı; yanıt kullanıcıya özel
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _not_modified(self, request, entry):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            return entry['etag'] in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return bool(entry['modified'] and if_modified_since
+                    and entry['modified'] <= if_modified_since)
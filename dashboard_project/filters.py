@@ -0,0 +1,68 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .search import normalize_search
+
+
+def start_of_day(day):
+    """Yerel saat diliminde günün başlangıcı (timezone-aware)"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def day_range_filters(field, date_from=None, date_to=None):
+    """
+    Yerel gün aralığını `field` üzerinde yarı açık datetime koşullarına çevir.
+
+    `field__date` karşılaştırması veritabanında saat dilimi dönüşümü yapar
+    ve sütundaki indeksi kullanamaz; sınırlar burada hesaplanır.
+    """
+    filters = {}
+    if date_from:
+        filters[f'{field}__gte'] = start_of_day(date_from)
+    if date_to:
+        filters[f'{field}__lt'] = start_of_day(date_to + timedelta(days=1))
+    return filters
+
+
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    Viewset'in `filter_serializer_class` ile doğruladığı sorgu parametrelerini uygular.
+
+    Serializer `filter_queryset(queryset)` metodunu tanımlar; geçersiz
+    parametreler 400 döndürür.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer_class = getattr(view, 'filter_serializer_class', None)
+        if serializer_class is None or getattr(view, 'action', None) != 'list':
+            return queryset
+        serializer = serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.filter_queryset(queryset)
+
+
+class StableOrderingFilter(OrderingFilter):
+    """Cursor sayfalamanın kararlı kalması için sıralamaya id ekler"""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = list(ordering)
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering.append('id')
+        return tuple(ordering)
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """?search= parametresi; modelin `search_text` sütununda aranır"""
+    search = serializers.CharField(required=False, allow_blank=True, max_length=100)
+
+    def filter_queryset(self, queryset):
+        term = normalize_search(self.validated_data.get('search'))
+        if term:
+            queryset = queryset.filter(search_text__contains=term)
+        return queryset
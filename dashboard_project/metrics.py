@@ -0,0 +1,267 @@
+"""
+İstek başına sorgu / süre ölçümü.
+
+`RequestMetricsMiddleware` her istek için toplam süreyi; örneklenen
+isteklerde ayrıca sorgu sayısını, veritabanı süresini ve renderer süresini
+ölçer. Renderer süresi yalnızca hazır `response.data`'nın bayta çevrilmesidir;
+serializer'ın `to_representation` işi view içinde çalışır ve toplam süreye
+dahildir. Sonuçlar:
+
+- `Server-Timing` başlığı (tarayıcı geliştirici araçlarında görünür)
+- `dashboard_project.metrics` logger'ına JSON satırı
+- `/metrics` uç noktasında Prometheus metin biçiminde histogramlar; uç nokta
+  yalnızca METRICS_TOKEN tanımlıysa (Bearer) veya DEBUG açıkken yanıt verir
+
+Histogramlar süreç başınadır; birden fazla worker varsa Prometheus her
+worker'dan ayrı toplar ya da toplamlar worker bazında okunur.
+
+Ayarlar: METRICS_ENABLED, METRICS_SAMPLE_RATE (0-1), METRICS_SERVER_TIMING,
+METRICS_LOG, METRICS_TOKEN.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+        # Kovalar birikimli değil, yazarken toplanır
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += 1
+        series[2] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, count, total) in sorted(self.series.items()):
+            label_text = _labels(labels)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+            lines.append(f"{self.name}_sum{{{label_text}}} {total:.6f}")
+        return lines
+
+
+def _labels(labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels)
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = Histogram(
+            'http_request_duration_seconds', "İstek süresi", DURATION_BUCKETS
+        )
+        self.db = Histogram(
+            'http_request_db_duration_seconds', "İstek başına veritabanı süresi (örneklenen)",
+            DURATION_BUCKETS,
+        )
+        self.queries = Histogram(
+            'http_request_queries', "İstek başına sorgu sayısı (örneklenen)", QUERY_BUCKETS
+        )
+        self.render = Histogram(
+            'http_response_renderer_seconds',
+            "Renderer süresi, serializer hariç (örneklenen)", DURATION_BUCKETS,
+        )
+        self.responses = {}
+
+    def record(self, view, method, status, timings):
+        labels = (('method', method), ('view', view))
+        with self.lock:
+            key = (*labels, ('status', str(status)))
+            self.responses[key] = self.responses.get(key, 0) + 1
+            self.requests.observe(labels, timings['total'])
+            if 'db' in timings:
+                self.db.observe(labels, timings['db'])
+                self.queries.observe(labels, timings['queries'])
+            if 'render' in timings:
+                self.render.observe(labels, timings['render'])
+
+    def render_text(self):
+        with self.lock:
+            lines = ["# HELP http_responses_total Yanıt sayısı", "# TYPE http_responses_total counter"]
+            lines.extend(
+                f"http_responses_total{{{_labels(labels)}}} {count}"
+                for labels, count in sorted(self.responses.items())
+            )
+            for histogram in (self.requests, self.db, self.queries, self.render):
+                lines.extend(histogram.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class QueryTimer:
+    """connection.execute_wrapper ile sorgu sayısı ve süresini toplar"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unknown'
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        self.server_timing = getattr(settings, 'METRICS_SERVER_TIMING', True)
+        self.log = getattr(settings, 'METRICS_LOG', False)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled or request.path_info == '/metrics':
+            return self.get_response(request)
+
+        sampled = self._sample(request)
+        start = time.perf_counter()
+        if not sampled:
+            response = self.get_response(request)
+            timings = {'total': time.perf_counter() - start}
+        else:
+            timer = QueryTimer()
+            with ExitStack() as stack:
+                # Sarmalayıcı bağlantı nesnesine eklenir; bağlantı henüz açık olmasa da çalışır
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timer))
+                response = self.get_response(request)
+            timings = {
+                'total': time.perf_counter() - start,
+                'db': timer.duration,
+                'queries': timer.count,
+            }
+        return self._finish(request, response, timings, sampled)
+
+    async def __acall__(self, request):
+        if not self.enabled or request.path_info == '/metrics':
+            return await self.get_response(request)
+
+        # ASGI altında sorgular başka thread'lerin bağlantılarında çalışır;
+        # burada yalnızca toplam ve render süresi ölçülür
+        sampled = self._sample(request)
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        timings = {'total': time.perf_counter() - start}
+        return self._finish(request, response, timings, sampled)
+
+    def _sample(self, request):
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        if sampled:
+            request._metrics_render = {}
+        return sampled
+
+    def _finish(self, request, response, timings, sampled):
+        render = getattr(request, '_metrics_render', None)
+        if render:
+            timings['render'] = render['duration']
+
+        view = _view_name(request)
+        registry.record(view, request.method, response.status_code, timings)
+        if sampled:
+            if self.server_timing:
+                response['Server-Timing'] = _server_timing(timings)
+            if self.log:
+                logger.info(json.dumps({
+                    'view': view,
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    **{
+                        key if key == 'queries' else f'{key}_ms':
+                        value if key == 'queries' else round(value * 1000, 3)
+                        for key, value in timings.items()
+                    },
+                }))
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response render edilmeden hemen önce çağrılır; bitişi
+        # post-render callback ile yakalanır
+        render = getattr(request, '_metrics_render', None)
+        if render is not None:
+            start = time.perf_counter()
+
+            def finished(rendered):
+                render['duration'] = time.perf_counter() - start
+
+            response.add_post_render_callback(finished)
+        return response
+
+
+def _server_timing(timings):
+    parts = []
+    if 'db' in timings:
+        parts.append(f'db;dur={timings["db"] * 1000:.2f};desc="{timings["queries"]} queries"')
+    if 'render' in timings:
+        parts.append(f'render;dur={timings["render"] * 1000:.2f}')
+    parts.append(f'total;dur={timings["total"] * 1000:.2f}')
+    return ', '.join(parts)
+
+
+def metrics_view(request):
+    """
+    Prometheus metin biçiminde süreç içi metrikler.
+
+    Varsayılan olarak kapalıdır (404); uç nokta başına süre ve sorgu sayıları
+    herkese açık olmamalı. METRICS_TOKEN tanımlıysa Bearer token istenir.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            raise Http404()
+    elif request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render_text(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
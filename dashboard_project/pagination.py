@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) tabanlı sayfalama.
+
+    OFFSET kullanmadığı için tablo büyüdükçe sayfa başına maliyet sabit kalır.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class OrderCursorPagination(DefaultCursorPagination):
+    # En yeni siparişler önce; aynı zaman damgasında id ile kararlı sıralama
+    ordering = ('-created_at', 'id')
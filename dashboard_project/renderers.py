@@ -0,0 +1,61 @@
+"""
+orjson tabanlı JSON renderer / parser.
+
+Ayarlarda `API_FAST_JSON=True` ile açılır. Çıktı DRF'in JSONRenderer'ı ile
+aynıdır: ondalıklar serializer'da string'e çevrildiği için string kalır,
+orjson'un doğrudan tanımadığı tipler (datetime, Decimal, lazy çeviri vb.)
+DRF'in JSONEncoder'ına devredilir. Girintili çıktı (`; indent=4`) ve
+`UNICODE_JSON=False` gibi orjson'un karşılamadığı durumlarda stdlib json'a düşer.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - isteğe bağlı bağımlılık
+    orjson = None
+
+_default = JSONEncoder().default
+
+
+def _options():
+    # datetime/dataclass orjson'a bırakılırsa biçim DRF'ten farklı olur
+    return (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_NON_STR_KEYS
+    )
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=_options())
+        # JSONRenderer ile aynı: çıktı JavaScript'in alt kümesi kalsın
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        # orjson NaN / Infinity kabul etmez; STRICT_JSON davranışıyla aynı
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,17 @@
+import unicodedata
+
+# Türkçe'ye özgü, NFKD ayrıştırmasıyla ASCII'ye inmeyen harfler
+_SEARCH_TRANSLATION = str.maketrans({'ı': 'i', 'İ': 'i'})
+
+
+def normalize_search(text):
+    """
+    Arama için büyük/küçük harf ve aksan duyarsız biçim.
+
+    "İSTANBUL Çiçekçisi" -> "istanbul cicekcisi". Hem kaydedilen arama
+    sütunu hem de arama sorgusu bu fonksiyondan geçer.
+    """
+    text = (text or '').translate(_SEARCH_TRANSLATION).lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).strip()
+
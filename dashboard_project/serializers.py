@@ -0,0 +1,143 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class EagerLoadingMixin:
+    """
+    Serializer'ın ihtiyaç duyduğu ilişkileri Meta üzerinden bildirmesini sağlar.
+
+    Meta.select_related_fields  -> ForeignKey / OneToOne ilişkileri (JOIN)
+    Meta.prefetch_related_fields -> ters / çoklu ilişkiler (ayrı sorgu)
+    Meta.only_fields            -> yalnızca bu sütunları SELECT et (`.only()`)
+
+    İç içe (nested) serializer alanları otomatik olarak taranır; böylece
+    viewset, `setup_eager_loading` ile tek seferde en uygun queryset'i kurar.
+    """
+
+    @classmethod
+    def get_select_related_fields(cls):
+        return list(getattr(cls.Meta, 'select_related_fields', []))
+
+    @classmethod
+    def get_prefetch_related_fields(cls):
+        return list(getattr(cls.Meta, 'prefetch_related_fields', []))
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Queryset'e serializer'ın bildirdiği ilişkileri ekle"""
+        select_related = cls.get_select_related_fields()
+        prefetch_related = cls.get_prefetch_related_fields()
+
+        for field_name, field in cls._declared_fields.items():
+            many = isinstance(field, serializers.ListSerializer)
+            child = field.child if many else field
+            if not isinstance(child, EagerLoadingMixin):
+                continue
+
+            source = field.source or field_name
+            if many:
+                # Ters ilişki: alt serializer'ın kendi ilişkileriyle prefetch et
+                child_queryset = child.setup_eager_loading(child.Meta.model.objects.all())
+                prefetch_related.append(Prefetch(source, queryset=child_queryset))
+            else:
+                select_related.append(source)
+                select_related.extend(
+                    f"{source}__{name}" for name in child.get_select_related_fields()
+                )
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        only_fields = getattr(cls.Meta, 'only_fields', None)
+        if only_fields:
+            queryset = queryset.only(*only_fields)
+        return queryset
+
+
+class IntegrityErrorMixin:
+    """
+    `save()` ayrı bir transaction'da çalışır; eşzamanlı isteklerde benzersizliği
+    veritabanı kısıtı garanti eder. Kısıt ihlali 500 yerine `integrity_error`
+    mesajıyla 400 döner.
+    """
+    integrity_error = None
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            raise serializers.ValidationError(self.integrity_error)
+
+
+class SparseFieldsMixin:
+    """
+    GET isteklerinde `?fields=id,total` ile yanıtı istenen alanlarla sınırlar.
+
+    Bilinmeyen alan adları 400 döndürür; yazma isteklerinde parametre yok sayılır.
+    """
+    fields_query_param = 'fields'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        value = request.query_params.get(self.fields_query_param)
+        if not value:
+            return fields
+        requested = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = requested - set(fields)
+        if unknown:
+            raise serializers.ValidationError({
+                self.fields_query_param: [f"Bilinmeyen alan: {', '.join(sorted(unknown))}"]
+            })
+        return {name: field for name, field in fields.items() if name in requested}
+
+
+def _amount_field():
+    return serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class DashboardQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    period = serializers.ChoiceField(choices=['day', 'week', 'month'], default='month')
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs):
+        date_from = attrs.get('date_from')
+        date_to = attrs.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError("Başlangıç tarihi bitiş tarihinden sonra olamaz.")
+        return attrs
+
+
+class DashboardTotalsSerializer(serializers.Serializer):
+    order_count = serializers.IntegerField()
+    subtotal = _amount_field()
+    discount_amount = _amount_field()
+    vat_amount = _amount_field()
+    total = _amount_field()
+
+
+class DashboardCompanySerializer(DashboardTotalsSerializer):
+    company_id = serializers.IntegerField()
+    company_name = serializers.CharField()
+
+
+class DashboardPeriodSerializer(DashboardTotalsSerializer):
+    period = serializers.DateField()
+
+
+class DashboardProductSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField()
+    product_code = serializers.CharField()
+    quantity = serializers.IntegerField(source='total_quantity')
+    subtotal = _amount_field()
+    total = _amount_field()
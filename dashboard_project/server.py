@@ -0,0 +1,125 @@
+"""
+gunicorn yapılandırması için yardımcılar (bkz. gunicorn.conf.py).
+
+Worker / thread sayısı CPU sayısından ve veritabanı bağlantı stratejisinden
+hesaplanır. CONN_MAX_AGE > 0 iken her thread kendi kalıcı bağlantısını
+tutar; bu yüzden thread sayısı aynı zamanda worker başına bağlantı sayısıdır.
+CONN_MAX_AGE = 0 iken her istek bağlantı kurma süresini de beklediği için
+daha fazla thread kullanılır. DB_MAX_CONNECTIONS verilirse toplam bağlantı
+bu sınırın altında kalacak şekilde worker sayısı azaltılır.
+"""
+import math
+import os
+import socket
+import struct
+import threading
+import time
+
+PERSISTENT_THREADS = 2
+SHORT_LIVED_THREADS = 4
+
+
+def available_cpus():
+    """Container / taskset kısıtlarını dikkate alan CPU sayısı"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Linux dışı
+        return os.cpu_count() or 1
+
+
+def connections_per_worker(db, worker_class, threads, async_db_threads):
+    """Bir worker sürecinin en fazla açacağı veritabanı bağlantısı"""
+    if worker_class == 'uvicorn':
+        # async view'ların thread havuzu + senkron view'ların tek thread'i
+        return async_db_threads + 1
+    pool = db.get('OPTIONS', {}).get('pool')
+    if isinstance(pool, dict):
+        return pool.get('max_size', threads)
+    return threads
+
+
+def server_sizing(cpus, db, worker_class='gthread', async_db_threads=8, max_db_connections=0):
+    """
+    (workers, threads) önerisi.
+
+    - sync: 2 x CPU + 1 worker, tek thread
+    - gthread: 2 x CPU + 1 worker; kalıcı bağlantıda 2, kısa ömürlü
+      bağlantıda 4 thread, psycopg havuzunda havuz boyutu kadar thread
+    - uvicorn (ASGI): CPU başına bir worker
+    """
+    if worker_class == 'uvicorn':
+        workers, threads = cpus, 1
+    elif worker_class == 'sync':
+        workers, threads = 2 * cpus + 1, 1
+    else:
+        workers = 2 * cpus + 1
+        pool = db.get('OPTIONS', {}).get('pool')
+        if isinstance(pool, dict):
+            threads = pool.get('max_size', SHORT_LIVED_THREADS)
+        elif db.get('CONN_MAX_AGE', 0) != 0:
+            threads = PERSISTENT_THREADS
+        else:
+            threads = SHORT_LIVED_THREADS
+
+    if max_db_connections and not db.get('DISABLE_SERVER_SIDE_CURSORS'):
+        # PgBouncer (DISABLE_SERVER_SIDE_CURSORS) bağlantıları kendisi çoğullar
+        per_worker = connections_per_worker(db, worker_class, threads, async_db_threads)
+        if per_worker > max_db_connections and worker_class == 'gthread':
+            threads = max_db_connections
+            per_worker = connections_per_worker(db, worker_class, threads, async_db_threads)
+        workers = max(1, min(workers, max_db_connections // max(per_worker, 1)))
+    return workers, threads
+
+
+def listen_queue_depth(sockets):
+    """
+    Dinleyen TCP soketlerinde kabul edilmeyi bekleyen bağlantı sayısı.
+
+    Linux'ta LISTEN durumundaki soket için TCP_INFO.tcpi_unacked anlık kuyruk
+    uzunluğudur. Desteklenmiyorsa (Unix soketi, Linux dışı) None döner.
+    """
+    if not hasattr(socket, 'TCP_INFO'):
+        return None
+    depth = None
+    for sock in sockets:
+        if getattr(sock, 'family', None) not in (socket.AF_INET, socket.AF_INET6):
+            continue
+        try:
+            info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, 104)
+        except OSError:
+            continue
+        # 8 adet u8 alanın ardından rto, ato, snd_mss, rcv_mss, unacked (u32)
+        unacked = struct.unpack_from('8B5I', info)[-1]
+        depth = (depth or 0) + unacked
+    return depth
+
+
+class WorkerStats:
+    """Worker içi istek süreleri; her `interval` saniyede bir özet döndürür"""
+
+    def __init__(self, interval=60):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.samples = []
+        self.started = time.monotonic()
+
+    def observe(self, duration):
+        with self.lock:
+            self.samples.append(duration)
+            elapsed = time.monotonic() - self.started
+            if elapsed < self.interval:
+                return None
+            samples, self.samples = sorted(self.samples), []
+            self.started = time.monotonic()
+
+        def pct(value):
+            return round(samples[max(math.ceil(value / 100 * len(samples)), 1) - 1] * 1000, 2)
+
+        return {
+            'requests': len(samples),
+            'rps': round(len(samples) / elapsed, 2),
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+            'p99_ms': pct(99),
+            'max_ms': round(samples[-1] * 1000, 2),
+        }
@@ -1,6 +1,7 @@
 from pathlib import Path
 from datetime import timedelta
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -34,6 +35,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
     "users",
     "company",
@@ -42,9 +44,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so the measured total covers the whole middleware chain
+    "dashboard_project.metrics.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Async-capable WhiteNoise so ASGI requests are not forced through a sync thread
+    "dashboard_project.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -72,30 +77,104 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "dashboard_project.wsgi.application"
 
-DATABASES = {
-    "default": (
-        # Prefer DATABASE_URL if provided (Railway, Render, etc.)
-        env.db_url("DATABASE_URL", default=None)
-        and {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": env.db_url("DATABASE_URL")["NAME"],
-            "USER": env.db_url("DATABASE_URL")["USER"],
-            "PASSWORD": env.db_url("DATABASE_URL")["PASSWORD"],
-            "HOST": env.db_url("DATABASE_URL")["HOST"],
-            "PORT": env.db_url("DATABASE_URL")["PORT"],
-            "CONN_MAX_AGE": 0,
-            "OPTIONS": {
-                # Railway supports TLS; if your instance doesn't, override via env: PGSSLMODE=disable
-                "sslmode": env("PGSSLMODE", default="require"),
-                "connect_timeout": 10,
-            },
+# Parse DATABASE_URL once (Railway, Render, etc.)
+DATABASE_URL = env.str("DATABASE_URL", default="")
+
+# Connection reuse strategy:
+#   "persistent" (default): keep one connection per worker for DB_CONN_MAX_AGE seconds
+#   "psycopg": Django's native psycopg 3 pool (requires `psycopg[pool]`)
+#   "pgbouncer": short-lived connections to a transaction-pooling PgBouncer
+DB_POOL_MODE = env.str("DB_POOL_MODE", default="persistent").strip().lower()
+if DB_POOL_MODE not in ("persistent", "psycopg", "pgbouncer"):
+    raise ImproperlyConfigured(
+        f"DB_POOL_MODE must be one of: persistent, psycopg, pgbouncer (got {DB_POOL_MODE!r})"
+    )
+
+if DATABASE_URL:
+    _db_url = env.db_url_config(DATABASE_URL)
+    _db = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": _db_url["NAME"],
+        "USER": _db_url["USER"],
+        "PASSWORD": _db_url["PASSWORD"],
+        "HOST": _db_url["HOST"],
+        "PORT": _db_url["PORT"],
+        "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=60),
+        # Validate reused connections before the first query of each request
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Railway supports TLS; if your instance doesn't, override via env: PGSSLMODE=disable
+            "sslmode": env("PGSSLMODE", default="require"),
+            "connect_timeout": 10,
+        },
+    }
+    if DB_POOL_MODE == "psycopg":
+        # The pool owns connection lifetime; Django requires CONN_MAX_AGE=0 here
+        _db["CONN_MAX_AGE"] = 0
+        _db["OPTIONS"]["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+            "timeout": env.int("DB_POOL_TIMEOUT", default=10),
         }
-    ) or {
-        # Local fallback (no DATABASE_URL): use SQLite
+    elif DB_POOL_MODE == "pgbouncer":
+        # Transaction pooling can't keep named cursors across transactions
+        _db["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=0)
+        _db["DISABLE_SERVER_SIDE_CURSORS"] = True
+else:
+    # Local fallback (no DATABASE_URL): use SQLite
+    _db = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
     }
+
+DATABASES = {"default": _db}
+
+# Local memory cache by default; set CACHE_URL (e.g. redis://host:6379/0) to share
+# the cache between workers.
+CACHE_URL = env.str("CACHE_URL", default="")
+CACHES = {
+    "default": env.cache_url_config(CACHE_URL) if CACHE_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Seconds a cached product/company list or detail response is kept; 0 disables
+# response caching. Invalidation bumps a version in the cache, so it only reaches
+# every worker through a shared cache: without CACHE_URL each gunicorn worker has
+# its own LocMemCache and the others would keep serving stale responses. Caching
+# is therefore off by default unless CACHE_URL is set (only override this for a
+# single-process deployment).
+API_CACHE_TIMEOUT = env.int("API_CACHE_TIMEOUT", default=300 if CACHE_URL else 0)
+
+# Hasher for new passwords: pbkdf2 (default), argon2 (needs argon2-cffi),
+# bcrypt (needs bcrypt) or scrypt. The others stay listed so existing hashes
+# still verify and are upgraded on the next successful login.
+PASSWORD_HASHER = env.str("PASSWORD_HASHER", default="pbkdf2").strip().lower()
+_password_hashers = {
+    "pbkdf2": "users.hashers.PBKDF2PasswordHasher",
+    "argon2": "users.hashers.Argon2PasswordHasher",
+    "bcrypt": "users.hashers.BCryptSHA256PasswordHasher",
+    "scrypt": "users.hashers.ScryptPasswordHasher",
 }
+if PASSWORD_HASHER not in _password_hashers:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of: {', '.join(_password_hashers)} (got {PASSWORD_HASHER!r})"
+    )
+PASSWORD_HASHERS = [
+    _password_hashers.pop(PASSWORD_HASHER),
+    *_password_hashers.values(),
+    "users.hashers.PBKDF2SHA1PasswordHasher",
+]
+# Cost parameters; changing them rehashes passwords on login
+ARGON2_TIME_COST = env.int("ARGON2_TIME_COST", default=2)
+ARGON2_MEMORY_COST = env.int("ARGON2_MEMORY_COST", default=19456)  # KiB
+ARGON2_PARALLELISM = env.int("ARGON2_PARALLELISM", default=1)
+BCRYPT_ROUNDS = env.int("BCRYPT_ROUNDS", default=12)
+# With PASSWORD_HASH_THREADS > 0 hashing runs on a per-process pool of that
+# size (e.g. the CPU count) so login bursts can't occupy every worker thread;
+# requests waiting longer than PASSWORD_HASH_QUEUE_TIMEOUT seconds get a 503.
+PASSWORD_HASH_THREADS = env.int("PASSWORD_HASH_THREADS", default=0)
+PASSWORD_HASH_QUEUE_TIMEOUT = env.float("PASSWORD_HASH_QUEUE_TIMEOUT", default=10)
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -117,16 +196,80 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
+    # Keyset (cursor) pagination; max page size is capped in the pagination class
+    "DEFAULT_PAGINATION_CLASS": "dashboard_project.pagination.DefaultCursorPagination",
+    "PAGE_SIZE": env.int("API_PAGE_SIZE", default=50),
 }
 
+# orjson-based JSON renderer/parser (optional dependency); output is identical
+# to DRF's JSONRenderer, decimals stay strings
+API_FAST_JSON = env.bool("API_FAST_JSON", default=False)
+if API_FAST_JSON:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "dashboard_project.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "dashboard_project.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
+# POST /api/orders/ with "Idempotency-Key" and "Prefer: respond-async" is
+# queued and answered with 202 instead of being processed inline; run
+# `manage.py process_order_requests` to work the queue (see order/jobs.py)
+ORDER_ASYNC_CREATE = env.bool("ORDER_ASYNC_CREATE", default=False)
+
+# Async read views (/api/async/...) run their queries on this many threads
+# per process, one DB connection each; size against the DB connection limit
+ASYNC_DB_THREADS = env.int("ASYNC_DB_THREADS", default=8)
+
+# Per-request instrumentation (see dashboard_project/metrics.py). Sampled
+# requests pay for query timing and get a Server-Timing header / log line;
+# total duration is always recorded. /metrics is only served with METRICS_TOKEN
+# (as a Bearer token) or with DEBUG on.
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_SAMPLE_RATE = env.float("METRICS_SAMPLE_RATE", default=1.0)
+METRICS_SERVER_TIMING = env.bool("METRICS_SERVER_TIMING", default=True)
+METRICS_LOG = env.bool("METRICS_LOG", default=False)
+METRICS_TOKEN = env.str("METRICS_TOKEN", default="")
+
+# /health/ready caches its database probe for this many seconds per process
+HEALTH_CHECK_CACHE_SECONDS = env.float("HEALTH_CHECK_CACHE_SECONDS", default=5)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "dashboard_project.metrics": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+# Per-worker cache of authenticated users; invalidated on user save/delete.
+# Other workers may serve a stale user for at most USER_CACHE_TTL seconds.
+USER_CACHE_TTL = env.int("USER_CACHE_TTL", default=60)
+USER_CACHE_MAX_SIZE = env.int("USER_CACHE_MAX_SIZE", default=1024)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": True,
+    # Fewer queries per refresh and a cache in front of the blacklist; run
+    # `manage.py purge_expired_tokens` on a schedule (see users/tokens.py)
+    "TOKEN_OBTAIN_SERIALIZER": "users.tokens.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.tokens.TokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "users.tokens.TokenBlacklistSerializer",
 }
 
 CORS_ALLOW_ALL_ORIGINS = False
@@ -148,3 +291,5 @@ if not DEBUG:
     SECURE_HSTS_INCLUDE_SUBDOMAINS = False
     SECURE_HSTS_PRELOAD = False
     SECURE_SSL_REDIRECT = True
+    # Load balancer probes and Prometheus scrapes reach the app over plain HTTP
+    SECURE_REDIRECT_EXEMPT = [r"^health", r"^metrics$"]
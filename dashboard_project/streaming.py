@@ -0,0 +1,5 @@
+class Echo:
+    """csv.writer için yazdığını geri döndüren sözde dosya (StreamingHttpResponse ile)"""
+
+    def write(self, value):
+        return value
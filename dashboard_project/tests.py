@@ -0,0 +1,285 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from benchmarks import runner
+from benchmarks.scenarios import SCENARIOS, build_context
+from benchmarks.seed import Scale, seed
+from company.models import Company
+from product.models import Product
+from . import renderers, views
+from .metrics import registry
+from .server import WorkerStats, listen_queue_depth, server_sizing
+
+User = get_user_model()
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class DashboardSummaryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+        self.companies = [
+            Company.objects.create(name=f'Şirket {i}', owner=self.user) for i in range(2)
+        ]
+        self.products = [
+            Product.objects.create(
+                code=f'P-{i}', name=f'Ürün {i}', price=Decimal('10.00'), owner=self.user
+            )
+            for i in range(2)
+        ]
+
+    def _order(self, company, lines, global_discount='0.00'):
+        payload = {
+            'company': company.pk,
+            'global_discount': global_discount,
+            'vat_rate': '20.00',
+            'items': [
+                {'product': product.pk, 'quantity': quantity, 'unit_price': '10.00'}
+                for product, quantity in lines
+            ],
+        }
+        response = self.client.post('/api/orders/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_summary_aggregates_orders(self):
+        self._order(self.companies[0], [(self.products[0], 2), (self.products[1], 1)])
+        self._order(self.companies[1], [(self.products[0], 1)], global_discount='50.00')
+
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, 200)
+
+        totals = response.data['totals']
+        self.assertEqual(totals['order_count'], 2)
+        self.assertEqual(totals['subtotal'], '40.00')
+        self.assertEqual(totals['discount_amount'], '5.00')
+        self.assertEqual(totals['total'], '42.00')
+
+        by_company = {row['company_id']: row for row in response.data['by_company']}
+        self.assertEqual(by_company[self.companies[0].pk]['total'], '36.00')
+
+        by_product = {row['product_id']: row for row in response.data['by_product']}
+        self.assertEqual(by_product[self.products[0].pk]['quantity'], 3)
+        self.assertEqual(by_product[self.products[0].pk]['subtotal'], '30.00')
+        self.assertEqual(by_product[self.products[0].pk]['total'], '30.00')
+
+        self.assertEqual(len(response.data['by_period']), 1)
+        self.assertEqual(response.data['by_period'][0]['order_count'], 2)
+
+    def test_invalid_date_range_is_rejected(self):
+        response = self.client.get(
+            '/api/dashboard/summary/', {'date_from': '2025-02-01', 'date_to': '2025-01-01'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, HEALTH_CHECK_CACHE_SECONDS=60)
+class HealthCheckTests(TestCase):
+    def setUp(self):
+        views.readiness = views.ReadinessProbe()
+
+    def test_live_does_no_io(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/live')
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_ready_probe_is_cached(self):
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['database']['status'], 'ok')
+        self.assertEqual(body['database']['migrations'], 'applied')
+        self.assertIn('latency_ms', body['database'])
+        self.assertIn('mode', body['pool'])
+        self.assertNotIn('allowed_hosts', body)
+
+        self.assertLess(body['checked_seconds_ago'], 1)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.json()['database'], body['database'])
+        self.assertGreaterEqual(response.json()['checked_seconds_ago'], 0)
+
+    def test_pending_migrations_not_ready(self):
+        with patch.object(views.MigrationExecutor, 'migration_plan', return_value=[object()]):
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['database']['migrations'], 'pending')
+
+    def test_migration_check_error_is_unavailable_and_cached(self):
+        with patch.object(
+            views.MigrationExecutor, 'migration_plan', side_effect=DatabaseError('bağlantı koptu'),
+        ):
+            response = self.client.get('/health/ready')
+            self.assertEqual(response.status_code, 503)
+            database = response.json()['database']
+            self.assertEqual(database['status'], 'error')
+            self.assertEqual(database['error'], 'DatabaseError')
+            self.assertEqual(database['migrations'], 'unknown')
+
+            with self.assertNumQueries(0):
+                response = self.client.get('/health/ready')
+            self.assertEqual(response.status_code, 503)
+
+
+@skipIf(renderers.orjson is None, "orjson kurulu değil")
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            'price': '12.50',
+            'raw_decimal': Decimal('1.10'),
+            'created_at': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'day': date(2025, 1, 2),
+            'id': uuid.UUID(int=1),
+            'label': gettext_lazy('Şirket'),
+            'note': 'satır\u2028sonu',
+            1: [None, True, 1.5],
+        }
+        self.assertEqual(renderers.ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_falls_back_to_stdlib(self):
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            renderers.ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+    def test_parser(self):
+        body = '{"name": "Çiçek", "total": 12.5, "items": [1, 2]}'.encode()
+        self.assertEqual(
+            renderers.ORJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body))
+        )
+        with self.assertRaises(ParseError):
+            renderers.ORJSONParser().parse(BytesIO(b'{"total": NaN}'))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BenchmarkSuiteTests(TestCase):
+    def test_scenarios_run_and_regressions_are_flagged(self):
+        users = seed(Scale(tenants=2, companies=2, products=5, orders=3, items=2))
+        ctx = build_context(users[0])
+        results = runner.run(SCENARIOS, ctx, iterations=2, warmup=0)
+
+        self.assertEqual(set(results), {scenario.name for scenario in SCENARIOS})
+        self.assertEqual(results['order_list']['queries'], 1)
+        self.assertLessEqual(results['order_list']['p50_ms'], results['order_list']['p99_ms'])
+
+        baseline = {'order_list': dict(results['order_list'], queries=0)}
+        self.assertEqual(
+            runner.compare(results, baseline), ["order_list: sorgu sayısı 0 -> 1"]
+        )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_and_prometheus_output(self):
+        response = self.client.get('/api/orders/')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="1 queries"')
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+        with self.settings(DEBUG=True):
+            text = self.client.get('/metrics').content.decode()
+        self.assertIn(
+            'http_responses_total{method="GET",view="order-list",status="200"} 1', text
+        )
+        self.assertIn('http_request_queries_bucket{method="GET",view="order-list",le="1"} 1', text)
+        self.assertIn('http_request_queries_bucket{method="GET",view="order-list",le="0"} 0', text)
+        self.assertIn('http_request_duration_seconds_count{method="GET",view="order-list"} 1', text)
+        self.assertIn('http_response_renderer_seconds_count{method="GET",view="order-list"} 1', text)
+
+    @override_settings(METRICS_LOG=True, METRICS_SERVER_TIMING=False)
+    def test_structured_log(self):
+        with self.assertLogs('dashboard_project.metrics', 'INFO') as logs:
+            response = self.client.get('/api/orders/')
+        self.assertFalse(response.has_header('Server-Timing'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'order-list')
+        self.assertEqual(record['queries'], 1)
+        self.assertIn('db_ms', record)
+
+    def test_metrics_closed_by_default(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN='secret', SECURE_SSL_REDIRECT=True)
+    def test_metrics_is_not_redirected_to_https(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/metrics/x').status_code, 301)
+
+
+class ServerSizingTests(SimpleTestCase):
+    sqlite = {'ENGINE': 'django.db.backends.sqlite3'}
+
+    def test_threads_follow_conn_max_age(self):
+        self.assertEqual(server_sizing(2, {'CONN_MAX_AGE': 0}), (5, 4))
+        self.assertEqual(server_sizing(2, {'CONN_MAX_AGE': 60}), (5, 2))
+        self.assertEqual(server_sizing(2, self.sqlite, worker_class='sync'), (5, 1))
+        self.assertEqual(server_sizing(2, self.sqlite, worker_class='uvicorn'), (2, 1))
+
+    def test_connection_budget(self):
+        pooled = {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': {'max_size': 10}}}
+        self.assertEqual(server_sizing(4, pooled, max_db_connections=25), (2, 10))
+        self.assertEqual(server_sizing(4, {'CONN_MAX_AGE': 60}, max_db_connections=1), (1, 1))
+        self.assertEqual(
+            server_sizing(4, self.sqlite, worker_class='uvicorn', async_db_threads=8,
+                          max_db_connections=20),
+            (2, 1),
+        )
+        # PgBouncer bağlantıları kendisi çoğullar
+        bouncer = {'CONN_MAX_AGE': 0, 'DISABLE_SERVER_SIDE_CURSORS': True}
+        self.assertEqual(server_sizing(4, bouncer, max_db_connections=5), (9, 4))
+
+    def test_worker_stats(self):
+        stats = WorkerStats(interval=0)
+        summary = stats.observe(0.25)
+        self.assertEqual(summary['requests'], 1)
+        self.assertEqual(summary['p95_ms'], 250.0)
+        self.assertEqual(stats.samples, [])
+
+        stats = WorkerStats(interval=60)
+        self.assertIsNone(stats.observe(0.1))
+
+    def test_listen_queue_depth(self):
+        import socket
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(8)
+        try:
+            depth = listen_queue_depth([listener])
+            if hasattr(socket, 'TCP_INFO'):
+                self.assertEqual(depth, 0)
+            client = socket.create_connection(listener.getsockname())
+            if hasattr(socket, 'TCP_INFO'):
+                self.assertEqual(listen_queue_depth([listener]), 1)
+            client.close()
+        finally:
+            listener.close()
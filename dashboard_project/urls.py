@@ -9,8 +9,13 @@ from rest_framework.routers import DefaultRouter
 from company.views import CompanyViewSet
 from product.views import ProductViewSet
 from order.views import OrderViewSet
+from company.async_views import CompanyAsyncView
+from order.async_views import OrderAsyncView
+from product.async_views import ProductAsyncView
+from dashboard_project.async_api import resource_urls
 from django.http import HttpResponse
-from dashboard_project.views import health_check
+from dashboard_project.views import health_live, health_ready, DashboardSummaryView
+from dashboard_project.metrics import metrics_view
 
 
 router = DefaultRouter()
@@ -24,9 +29,18 @@ urlpatterns = [
     path('api/register/', RegisterView.as_view(), name='register'),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/dashboard/summary/', DashboardSummaryView.as_view(), name='dashboard_summary'),
+
+    # ASGI altında event loop'u bloklamayan okuma uçları (bkz. async_api.py)
+    *resource_urls('api/async/companies', CompanyAsyncView, 'company'),
+    *resource_urls('api/async/products', ProductAsyncView, 'product'),
+    *resource_urls('api/async/orders', OrderAsyncView, 'order'),
 
     # 🌟 Bunu ekliyoruz:
     path('api/', include(router.urls)),
-    path("health", health_check),
+    path("health/live", health_live),
+    path("health/ready", health_ready),
+    path("health", health_ready),
+    path("metrics", metrics_view),
     path("", lambda r: HttpResponse("Backend OK"))
 ]
\ No newline at end of file
@@ -1,26 +1,194 @@
+import threading
+import time
+
 from django.http import JsonResponse
 from django.conf import settings
 from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count, DateField, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from order.models import Order, SalesRollup
+from .filters import day_range_filters
+from .serializers import (
+    DashboardCompanySerializer,
+    DashboardPeriodSerializer,
+    DashboardProductSerializer,
+    DashboardQuerySerializer,
+    DashboardTotalsSerializer,
+)
+
+def health_live(request):
+    """Liveness: süreç istek karşılayabiliyor mu; veritabanına / diske dokunmaz"""
+    return JsonResponse({"status": "ok"})
+
+
+class ReadinessProbe:
+    """
+    Readiness kontrolü; sonuç süreç içinde HEALTH_CHECK_CACHE_SECONDS boyunca
+    saklanır, böylece sık yoklama her seferinde bağlantı açıp sorgu çalıştırmaz.
+    Aynı anda gelen yoklamalardan yalnızca biri kontrolü yapar.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.result = None
+        self.checked_at = None
+        self.migrations_applied = False
+
+    def get(self):
+        ttl = getattr(settings, 'HEALTH_CHECK_CACHE_SECONDS', 5)
+        with self.lock:
+            now = time.monotonic()
+            if self.result is None or now - self.checked_at >= ttl:
+                self.result = self.check()
+                self.checked_at = time.monotonic()
+            return self.result, round(time.monotonic() - self.checked_at, 3)
+
+    def check(self):
+        database = {"engine": connection.vendor}
+        try:
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            database["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            database["migrations"] = self.migration_status()
+            database["status"] = "ok"
+        except Exception as e:
+            # Bağlantı bilgisi sızmasın diye yalnızca hata türü döner
+            database["status"] = "error"
+            database["error"] = type(e).__name__
+            database["migrations"] = "unknown"
+            return {"status": "unavailable", "database": database, "pool": self.pool_state()}
+
+        ready = database["migrations"] == "applied"
+        return {
+            "status": "ok" if ready else "unavailable",
+            "database": database,
+            "pool": self.pool_state(),
+        }
+
+    def migration_status(self):
+        # Çalışan bir süreçte uygulanmış migration geri alınmaz; bir kez
+        # "applied" görüldükten sonra migration dosyaları yeniden okunmaz
+        if self.migrations_applied:
+            return "applied"
+        executor = MigrationExecutor(connection)
+        pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if pending:
+            return "pending"
+        self.migrations_applied = True
+        return "applied"
+
+    def pool_state(self):
+        state = {
+            "mode": getattr(settings, 'DB_POOL_MODE', None),
+            "conn_max_age": settings.DATABASES['default'].get('CONN_MAX_AGE', 0),
+        }
+        pool = getattr(connection, 'pool', None)
+        if pool is not None:
+            stats = pool.get_stats()
+            state.update(
+                size=stats.get('pool_size'),
+                available=stats.get('pool_available'),
+                waiting=stats.get('requests_waiting'),
+            )
+        return state
+
+
+readiness = ReadinessProbe()
+
+
+def health_ready(request):
+    """Readiness: veritabanı erişilebilir ve migration'lar uygulanmış mı"""
+    result, age = readiness.get()
+    status = 200 if result["status"] == "ok" else 503
+    return JsonResponse({**result, "checked_seconds_ago": age}, status=status)
+
+
+PERIOD_TRUNCATORS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def _order_totals():
+    """Sipariş toplamları için SQL aggregate ifadeleri"""
+    amount = DecimalField(max_digits=14, decimal_places=2)
+    return {
+        'order_count': Count('id'),
+        'subtotal': Coalesce(Sum('subtotal'), Value(0), output_field=amount),
+        'discount_amount': Coalesce(Sum('discount_amount'), Value(0), output_field=amount),
+        'vat_amount': Coalesce(Sum('vat_amount'), Value(0), output_field=amount),
+        'total': Coalesce(Sum('total'), Value(0), output_field=amount),
+    }
+
+
+class DashboardSummaryView(APIView):
+    """
+    Gösterge paneli özetleri; tüm hesaplamalar veritabanında yapılır.
+
+    `by_product` rollup tablosundan okunur ve kalem bazında yuvarlanmıştır;
+    `totals` / `by_company` ile sipariş başına kalem sayısı kadar kuruş
+    farkı olabilir (bkz. order.rollup).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        params = DashboardQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        date_from = params.validated_data.get('date_from')
+        date_to = params.validated_data.get('date_to')
+        period = params.validated_data['period']
+        limit = params.validated_data['limit']
+
+        orders = Order.objects.filter(
+            owner=request.user, **day_range_filters('created_at', date_from, date_to)
+        )
+
+        totals = orders.aggregate(**_order_totals())
+
+        by_company = (
+            orders.values('company_id', company_name=F('company__name'))
+            .annotate(**_order_totals())
+            .order_by('-total')[:limit]
+        )
+
+        truncate = PERIOD_TRUNCATORS[period]
+        by_period = (
+            orders.annotate(period=truncate('created_at', output_field=DateField()))
+            .values('period')
+            .annotate(**_order_totals())
+            .order_by('period')
+        )
+
+        # Ürün kırılımı kalemleri taramak yerine günlük rollup tablosundan okunur
+        rollups = SalesRollup.objects.filter(owner=request.user)
+        if date_from:
+            rollups = rollups.filter(day__gte=date_from)
+        if date_to:
+            rollups = rollups.filter(day__lte=date_to)
+        by_product = (
+            rollups.values(
+                'product_id',
+                product_name=F('product__name'),
+                product_code=F('product__code'),
+            )
+            .annotate(
+                total_quantity=Sum('quantity'),
+                subtotal=Sum('subtotal'),
+                total=Sum('total'),
+            )
+            .order_by('-total')[:limit]
+        )
 
-def health_check(request):
-    """Health check endpoint with database connectivity test"""
-    try:
-        # Test database connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        
-        db_status = "connected"
-        db_engine = settings.DATABASES['default']['ENGINE']
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-        db_engine = "unknown"
-    
-    return JsonResponse({
-        "status": "ok",
-        "debug": settings.DEBUG,
-        "database": {
-            "engine": db_engine,
-            "status": db_status
-        },
-        "allowed_hosts": settings.ALLOWED_HOSTS,
-    })
+        return Response({
+            'period': period,
+            'totals': DashboardTotalsSerializer(totals).data,
+            'by_company': DashboardCompanySerializer(by_company, many=True).data,
+            'by_product': DashboardProductSerializer(by_product, many=True).data,
+            'by_period': DashboardPeriodSerializer(by_period, many=True).data,
+        })
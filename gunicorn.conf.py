@@ -0,0 +1,90 @@
+"""
+gunicorn yapılandırması; proje kökünden `gunicorn` ile otomatik okunur.
+
+Ortam değişkenleri (hepsi isteğe bağlı):
+  PORT                          dinlenecek port (varsayılan 8000)
+  GUNICORN_WORKER_CLASS         sync | gthread (varsayılan) | uvicorn (ASGI)
+  GUNICORN_WORKERS / _THREADS   hesaplanan değerleri ezer
+  DB_MAX_CONNECTIONS            tüm worker'ların açabileceği toplam DB bağlantısı
+  GUNICORN_MAX_REQUESTS         worker'ı bu kadar istekten sonra yenile (varsayılan 1000)
+  GUNICORN_MAX_REQUESTS_JITTER  tüm worker'ların aynı anda yenilenmemesi için (varsayılan 100)
+  GUNICORN_TIMEOUT              varsayılan 30 sn
+  GUNICORN_STATS_INTERVAL       worker istatistik log aralığı (sn, 0: kapalı; varsayılan 60)
+"""
+import json
+import os
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dashboard_project.settings')
+
+from django.conf import settings  # noqa: E402
+
+from dashboard_project.server import (  # noqa: E402
+    WorkerStats, available_cpus, listen_queue_depth, server_sizing,
+)
+
+_worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+_workers, _threads = server_sizing(
+    available_cpus(),
+    settings.DATABASES['default'],
+    worker_class=_worker_class,
+    async_db_threads=settings.ASYNC_DB_THREADS,
+    max_db_connections=int(os.environ.get('DB_MAX_CONNECTIONS', 0)),
+)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+if _worker_class == 'uvicorn':
+    wsgi_app = 'dashboard_project.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'dashboard_project.wsgi:application'
+    worker_class = _worker_class
+workers = int(os.environ.get('GUNICORN_WORKERS', _workers))
+threads = int(os.environ.get('GUNICORN_THREADS', _threads))
+
+# Uygulama master'da bir kez yüklenir; worker'lar belleği copy-on-write paylaşır
+preload_app = True
+
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = 5
+
+accesslog = '-'
+access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(M)sms'
+
+_stats_interval = int(os.environ.get('GUNICORN_STATS_INTERVAL', 60))
+
+
+def when_ready(server):
+    server.log.info(
+        "workers=%s threads=%s worker_class=%s conn_max_age=%s",
+        workers, threads, worker_class, settings.DATABASES['default'].get('CONN_MAX_AGE'),
+    )
+
+
+def post_fork(server, worker):
+    # preload sırasında master'da açılmış bir bağlantı varsa worker'lar paylaşmasın
+    from django.db import connections
+    connections.close_all()
+    worker.stats = WorkerStats(_stats_interval) if _stats_interval else None
+
+
+def pre_request(worker, req):
+    req.started_at = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    stats = getattr(worker, 'stats', None)
+    started_at = getattr(req, 'started_at', None)
+    if stats is None or started_at is None:
+        return
+    summary = stats.observe(time.perf_counter() - started_at)
+    if summary is not None:
+        summary.update(
+            pid=worker.pid,
+            in_flight=getattr(worker, 'nr_conns', None),
+            listen_queue=listen_queue_depth(worker.sockets),
+        )
+        worker.log.info("worker_stats %s", json.dumps(summary))
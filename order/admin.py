@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Order, OrderItem
+from .pricing import recalculate_in_db
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
@@ -16,6 +17,12 @@ class OrderAdmin(admin.ModelAdmin):
         'created_at', 'owner'
     )
     inlines = [OrderItemInline]
+    actions = ['recalculate_totals']
+
+    @admin.action(description="Seçili siparişlerin tutarlarını yeniden hesapla")
+    def recalculate_totals(self, request, queryset):
+        updated = recalculate_in_db(queryset)
+        self.message_user(request, f"{updated} siparişin tutarları yeniden hesaplandı.")
 
 admin.site.register(Order, OrderAdmin)
 admin.site.register(OrderItem)
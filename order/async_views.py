@@ -0,0 +1,20 @@
+from dashboard_project.async_api import AsyncReadView
+from dashboard_project.pagination import OrderCursorPagination
+from .models import Order
+from .serializers import OrderFilterSerializer, OrderListSerializer, OrderSerializer
+
+
+class OrderAsyncView(AsyncReadView):
+    serializer_class = OrderSerializer
+    list_serializer_class = OrderListSerializer
+    filter_serializer_class = OrderFilterSerializer
+    pagination_class = OrderCursorPagination
+
+    def get_queryset(self, user):
+        return Order.objects.filter(owner=user)
+
+    def get_list_serializer_class(self, request):
+        # Senkron viewset ile aynı: kalemler `?expand=items` ile gelir
+        if 'items' in request.GET.get('expand', '').split(','):
+            return OrderSerializer
+        return OrderListSerializer
@@ -0,0 +1,111 @@
+import csv
+import json
+import tempfile
+
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from dashboard_project.filters import day_range_filters
+from dashboard_project.streaming import Echo
+from .models import Order, OrderItem
+
+EXPORT_COLUMNS = [
+    'order_id', 'created_at', 'delivery_date', 'company_id', 'company_name',
+    'global_discount', 'vat_rate', 'subtotal', 'discount_amount', 'vat_amount', 'total',
+    'product_code', 'product_name', 'quantity', 'unit_price', 'item_discount',
+]
+
+
+def export_queryset(user, date_from=None, date_to=None, company=None):
+    """Filtreleri SQL'e indirgenmiş, kalemleri parça parça prefetch eden queryset"""
+    orders = Order.objects.filter(owner=user, **day_range_filters('created_at', date_from, date_to))
+    if company:
+        orders = orders.filter(company_id=company)
+    return (
+        orders.select_related('company')
+        .prefetch_related(
+            Prefetch('items', queryset=OrderItem.objects.select_related('product').order_by('id'))
+        )
+        .order_by('created_at', 'id')
+    )
+
+
+def iter_orders(queryset, chunk_size=500):
+    # iterator() PostgreSQL'de sunucu taraflı cursor kullanır; prefetch her
+    # parça için ayrı çalışır, böylece bellek kullanımı sabit kalır
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_line_rows(orders):
+    """Her sipariş kalemi için düz bir satır üret"""
+    for order in orders:
+        header = [
+            order.pk,
+            timezone.localtime(order.created_at).isoformat(),
+            order.delivery_date.isoformat(),
+            order.company_id, order.company.name,
+            order.global_discount, order.vat_rate,
+            order.subtotal, order.discount_amount, order.vat_amount, order.total,
+        ]
+        for item in order.items.all():
+            yield header + [
+                item.product.code, item.product.name,
+                item.quantity, item.unit_price, item.item_discount,
+            ]
+
+
+def csv_stream(orders):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in iter_line_rows(orders):
+        yield writer.writerow(row)
+
+
+def jsonl_stream(orders):
+    """Her satırda kalemleriyle birlikte bir sipariş"""
+    for order in orders:
+        yield json.dumps({
+            'id': order.pk,
+            'created_at': timezone.localtime(order.created_at).isoformat(),
+            'delivery_date': order.delivery_date.isoformat(),
+            'company_id': order.company_id,
+            'company_name': order.company.name,
+            'global_discount': str(order.global_discount),
+            'vat_rate': str(order.vat_rate),
+            'subtotal': str(order.subtotal),
+            'discount_amount': str(order.discount_amount),
+            'vat_amount': str(order.vat_amount),
+            'total': str(order.total),
+            'items': [
+                {
+                    'product_id': item.product_id,
+                    'product_code': item.product.code,
+                    'product_name': item.product.name,
+                    'quantity': item.quantity,
+                    'unit_price': str(item.unit_price),
+                    'item_discount': str(item.item_discount),
+                }
+                for item in order.items.all()
+            ],
+        }, ensure_ascii=False) + '\n'
+
+
+def xlsx_file(orders):
+    """
+    openpyxl write-only modunda geçici dosyaya yaz.
+
+    XLSX bir zip arşivi olduğundan parça parça gönderilemez; satırlar yine de
+    bellekte tutulmaz. openpyxl kurulu değilse ImportError fırlatır.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('orders')
+    sheet.append(EXPORT_COLUMNS)
+    for row in iter_line_rows(orders):
+        sheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
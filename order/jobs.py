@@ -0,0 +1,172 @@
+"""
+Idempotent sipariş oluşturma ve veritabanı tabanlı iş kuyruğu.
+
+`Idempotency-Key` başlığıyla gelen POST /api/orders/ istekleri bir
+OrderRequest kaydına bağlanır. Senkron modda sipariş aynı transaction
+içinde oluşturulur; asenkron modda kayıt PENDING olarak kalır ve
+`process_order_requests` komutu tarafından işlenir. Harici bir broker
+gerekmez: işler koşullu UPDATE ile sahiplenilir, böylece aynı iş iki
+worker'da birden çalışmaz.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OrderRequest
+from .serializers import OrderSerializer
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+
+def payload_hash(data):
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode()
+    ).hexdigest()
+
+
+def submit(user, key, data, run_async=False):
+    """
+    İsteği kaydet; aynı anahtar daha önce kullanıldıysa mevcut kaydı döndür.
+
+    (order_request, created) döndürür. Senkron modda yeni kayıt hemen
+    işlenir; işleme sırasında beklenmeyen bir hata olursa kayıt da geri
+    alınır ve istemci aynı anahtarla tekrar deneyebilir.
+    """
+    # Tekrarlar için hızlı yol: tek SELECT
+    existing = OrderRequest.objects.filter(owner=user, idempotency_key=key).first()
+    if existing is not None:
+        return existing, False
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                order_request = OrderRequest.objects.create(
+                    owner=user,
+                    idempotency_key=key,
+                    payload=data,
+                    payload_hash=payload_hash(data),
+                    status=OrderRequest.PENDING if run_async else OrderRequest.PROCESSING,
+                    locked_at=None if run_async else timezone.now(),
+                )
+        except IntegrityError:
+            # Aynı anahtarla eşzamanlı gelen başka bir istek önce yazdı
+            return OrderRequest.objects.get(owner=user, idempotency_key=key), False
+
+        if not run_async:
+            process(order_request)
+    return order_request, True
+
+
+def process(order_request):
+    """
+    Sahiplenilmiş (PROCESSING) isteği doğrula ve siparişi yaz.
+
+    Sipariş ve sonuç aynı transaction'da kaydedilir. İş bu arada başka bir
+    worker tarafından yeniden sahiplenildiyse (locked_at değişmişse) hiçbir
+    şey yazılmaz ve False döner.
+    """
+    owner = order_request.owner
+    # Serializer'ın kullandığı tek istek bilgisi kullanıcı ve metot
+    context = {'request': SimpleNamespace(user=owner, method='POST')}
+    serializer = OrderSerializer(data=order_request.payload, context=context)
+
+    with transaction.atomic():
+        if serializer.is_valid():
+            order = serializer.save(owner=owner)
+            result = {
+                'status': OrderRequest.SUCCEEDED,
+                'order': order,
+                'response_status': 201,
+                'response_body': serializer.data,
+            }
+        else:
+            result = {
+                'status': OrderRequest.FAILED,
+                'response_status': 400,
+                'response_body': serializer.errors,
+            }
+        result['completed_at'] = timezone.now()
+
+        updated = OrderRequest.objects.filter(
+            pk=order_request.pk,
+            status=OrderRequest.PROCESSING,
+            locked_at=order_request.locked_at,
+        ).update(**result)
+        if not updated:
+            transaction.set_rollback(True)
+            return False
+
+    for field, value in result.items():
+        setattr(order_request, field, value)
+    return True
+
+
+def _claimable(stale_before):
+    # Takılı kalan (worker'ı ölmüş) işler de yeniden alınır
+    return Q(status=OrderRequest.PENDING) | Q(
+        status=OrderRequest.PROCESSING, locked_at__lt=stale_before
+    )
+
+
+def claim(limit, stale_after=timedelta(minutes=5)):
+    """En eski bekleyen işlerden en fazla `limit` tanesini sahiplen"""
+    now = timezone.now()
+    candidates = list(
+        OrderRequest.objects.filter(_claimable(now - stale_after))
+        .order_by('id')
+        .values_list('id', flat=True)[:limit]
+    )
+    claimed = [
+        pk for pk in candidates
+        # Koşullu UPDATE: iki worker aynı işi görse bile yalnızca biri alır
+        if OrderRequest.objects.filter(_claimable(now - stale_after), pk=pk)
+        .update(status=OrderRequest.PROCESSING, locked_at=now, attempts=F('attempts') + 1)
+    ]
+    return list(
+        OrderRequest.objects.filter(pk__in=claimed).select_related('owner').order_by('id')
+    )
+
+
+def run_pending(limit=50, stale_after=timedelta(minutes=5)):
+    """Bir parti işi işle; işlenen iş sayısını döndürür"""
+    order_requests = claim(limit, stale_after)
+    for order_request in order_requests:
+        try:
+            process(order_request)
+        except Exception:
+            logger.exception("Sipariş isteği işlenemedi: %s", order_request.pk)
+            _release(order_request)
+    return len(order_requests)
+
+
+def _release(order_request):
+    """Hatalı işi tekrar kuyruğa al; deneme hakkı bittiyse başarısız say"""
+    if order_request.attempts >= MAX_ATTEMPTS:
+        changes = {
+            'status': OrderRequest.FAILED,
+            'response_status': 500,
+            'response_body': {'detail': "Sipariş işlenemedi."},
+            'completed_at': timezone.now(),
+        }
+    else:
+        changes = {'status': OrderRequest.PENDING, 'locked_at': None}
+    OrderRequest.objects.filter(
+        pk=order_request.pk, locked_at=order_request.locked_at
+    ).update(**changes)
+
+
+def purge_finished(older_than):
+    """Sonuçlanmış eski kayıtları sil; silinen kayıt sayısını döndürür"""
+    deleted, _ = OrderRequest.objects.filter(
+        status__in=[OrderRequest.SUCCEEDED, OrderRequest.FAILED],
+        completed_at__lt=timezone.now() - older_than,
+    ).delete()
+    return deleted
@@ -0,0 +1,85 @@
+import timeit
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from company.models import Company
+from dashboard_project import renderers
+from order.models import Order, OrderItem
+from order.serializers import OrderSerializer
+from product.models import Product
+
+
+def build_orders(count, items_per_order):
+    """Veritabanına yazmadan, kalemleri önceden yüklenmiş sipariş örnekleri"""
+    company = Company(pk=1, name='Örnek Şirket A.Ş.')
+    products = [
+        Product(pk=i, code=f'P-{i:05d}', name=f'Ürün {i}', price=Decimal('12.50'))
+        for i in range(1, items_per_order + 1)
+    ]
+    orders = []
+    for i in range(1, count + 1):
+        order = Order(
+            pk=i, company=company, owner_id=1,
+            delivery_date=date(2025, 1, 1),
+            created_at=datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc),
+            global_discount=Decimal('5.00'), vat_rate=Decimal('20.00'),
+            subtotal=Decimal('1234.56'), discount_amount=Decimal('61.73'),
+            vat_amount=Decimal('234.57'), total=Decimal('1407.40'),
+        )
+        order._prefetched_objects_cache = {'items': [
+            OrderItem(
+                pk=i * items_per_order + j, order=order, product=product, quantity=j + 1,
+                unit_price=Decimal('12.50'), item_discount=Decimal('2.50'),
+            )
+            for j, product in enumerate(products)
+        ]}
+        orders.append(order)
+    return orders
+
+
+class Command(BaseCommand):
+    help = (
+        "OrderSerializer liste çıktısını stdlib json ve orjson renderer/parser "
+        "ile ölçer (veritabanı kullanılmaz)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=500)
+        parser.add_argument('--items', type=int, default=5, help="Sipariş başına kalem")
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError("orjson kurulu değil.")
+
+        data = OrderSerializer(build_orders(options['orders'], options['items']), many=True).data
+        fast, slow = renderers.ORJSONRenderer(), JSONRenderer()
+        body = slow.render(data)
+        if fast.render(data) != body:
+            raise CommandError("orjson çıktısı JSONRenderer ile aynı değil.")
+
+        self.stdout.write(
+            f"{options['orders']} sipariş x {options['items']} kalem, {len(body) / 1024:.0f} KiB"
+        )
+        self._compare("render", lambda: slow.render(data), lambda: fast.render(data), options)
+        self._compare(
+            "parse",
+            lambda: JSONParser().parse(BytesIO(body)),
+            lambda: renderers.ORJSONParser().parse(BytesIO(body)),
+            options,
+        )
+
+    def _compare(self, label, stdlib, fast, options):
+        repeat = options['repeat']
+        stdlib_ms = min(timeit.repeat(stdlib, number=1, repeat=repeat)) * 1000
+        fast_ms = min(timeit.repeat(fast, number=1, repeat=repeat)) * 1000
+        self.stdout.write(
+            f"{label:<7} json: {stdlib_ms:8.2f} ms  orjson: {fast_ms:8.2f} ms  "
+            f"x{stdlib_ms / fast_ms:.1f}"
+        )
+
@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from order.jobs import purge_finished, run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Kuyruktaki asenkron sipariş isteklerini işler. Birden fazla süreç "
+        "aynı anda çalıştırılabilir; her iş yalnızca bir kez sahiplenilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Kuyruğu boşaltıp çık")
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Saniye")
+        parser.add_argument(
+            '--stale-after', type=int, default=300,
+            help="Bu kadar saniyedir işlenen iş yeniden kuyruğa alınır",
+        )
+        parser.add_argument(
+            '--purge-days', type=int, default=0,
+            help="Bundan eski sonuçlanmış istekleri sil (0: silme)",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size en az 1 olmalı.")
+        stale_after = timedelta(seconds=options['stale_after'])
+
+        processed = 0
+        last_purge = 0
+        try:
+            while True:
+                close_old_connections()
+                count = run_pending(options['batch_size'], stale_after)
+                processed += count
+                if count:
+                    continue
+                # Temizlik boşta kalındığında, en fazla saatte bir çalışır
+                if options['purge_days'] and time.monotonic() - last_purge > 3600:
+                    purge_finished(timedelta(days=options['purge_days']))
+                    last_purge = time.monotonic()
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"{processed} istek işlendi."))
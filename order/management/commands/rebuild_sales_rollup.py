@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from order.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Satış özet (rollup) tablosunu sipariş kalemlerinden sıfırdan oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, help="Sadece bu kullanıcı id'si için yeniden oluştur")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_rollup(options['owner'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{count} rollup satırı oluşturuldu."))
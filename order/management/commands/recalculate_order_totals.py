@@ -0,0 +1,145 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from order.models import Order, OrderItem
+from order.pricing import calculate_totals_batch, recalculate_in_db
+
+TOTAL_FIELDS = ['subtotal', 'discount_amount', 'vat_amount', 'total']
+
+
+def process_chunk(first_id, last_id, method, dry_run):
+    """
+    [first_id, last_id] aralığındaki siparişleri yeniden hesapla.
+
+    Değişen siparişler için (id, {alan: (eski, yeni)}) listesi döndürür.
+    Paralel modda ayrı süreçlerde çalıştığı için modül seviyesindedir.
+    """
+    orders = Order.objects.filter(pk__gte=first_id, pk__lte=last_id)
+    stored = {
+        row[0]: row[3:]
+        for row in orders.values_list('id', 'global_discount', 'vat_rate', *TOTAL_FIELDS)
+    }
+    computed = calculate_totals_batch(
+        orders.values_list('id', 'global_discount', 'vat_rate'),
+        OrderItem.objects.filter(order_id__gte=first_id, order_id__lte=last_id)
+        .values_list('order_id', 'quantity', 'unit_price', 'item_discount'),
+    )
+
+    diffs = []
+    for order_id, totals in computed.items():
+        changes = {
+            field: (old, new)
+            for field, old, new in zip(TOTAL_FIELDS, stored[order_id], totals)
+            if old != new
+        }
+        if changes:
+            diffs.append((order_id, changes))
+
+    if dry_run or not diffs:
+        return diffs
+
+    if method == 'sql':
+        recalculate_in_db(orders)
+    else:
+        changed = []
+        for order_id, _ in diffs:
+            order = Order(pk=order_id)
+            order.subtotal, order.discount_amount, order.vat_amount, order.total = computed[order_id]
+            changed.append(order)
+        with transaction.atomic():
+            Order.objects.bulk_update(changed, TOTAL_FIELDS)
+    return diffs
+
+
+def _init_worker():
+    # spawn ile başlatılan süreçlerde Django'yu hazırla (fork'ta zaten hazırdır)
+    import django
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Siparişlerin subtotal / discount_amount / vat_amount / total alanlarını "
+        "kalemlerden yeniden hesaplar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--method', choices=['python', 'sql'], default='python',
+            help="python: bulk_update ile sadece değişenler; sql: parça başına tek UPDATE",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Yazmadan farkları göster")
+        parser.add_argument('--checkpoint', help="İşlenen son sipariş id'sinin saklandığı dosya")
+        parser.add_argument('--resume', action='store_true', help="Checkpoint dosyasından devam et")
+        parser.add_argument('--workers', type=int, default=1, help="Paralel süreç sayısı")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError("--batch-size ve --workers en az 1 olmalı.")
+        if options['resume'] and not options['checkpoint']:
+            raise CommandError("--resume için --checkpoint gerekli.")
+
+        self.checkpoint = Path(options['checkpoint']) if options['checkpoint'] else None
+        start_after = self._read_checkpoint() if options['resume'] else 0
+
+        chunks = self._iter_chunks(start_after, options['batch_size'])
+        args = (options['method'], options['dry_run'])
+
+        changed = 0
+        if options['workers'] == 1:
+            for first_id, last_id in chunks:
+                changed += self._report(process_chunk(first_id, last_id, *args), options)
+                self._write_checkpoint(last_id, options)
+        else:
+            # Aralıklar fork'tan önce belirlenir; alt süreçler ebeveynin
+            # bağlantısını devralmamalı, kendi bağlantılarını açmalı
+            chunks = list(chunks)
+            connections.close_all()
+            with ProcessPoolExecutor(options['workers'], initializer=_init_worker) as pool:
+                futures = [
+                    (last_id, pool.submit(process_chunk, first_id, last_id, *args))
+                    for first_id, last_id in chunks
+                ]
+                # Sonuçlar sırayla alınır; checkpoint sadece kesintisiz tamamlanan
+                # parçaların sonuna ilerler
+                for last_id, future in futures:
+                    changed += self._report(future.result(), options)
+                    self._write_checkpoint(last_id, options)
+
+        verb = "değişecek" if options['dry_run'] else "güncellendi"
+        self.stdout.write(self.style.SUCCESS(f"{changed} sipariş {verb}."))
+
+    def _iter_chunks(self, start_after, batch_size):
+        """Sipariş id'leri üzerinde keyset sayfalama ile (ilk_id, son_id) aralıkları"""
+        cursor = start_after
+        while True:
+            ids = list(
+                Order.objects.filter(pk__gt=cursor)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return
+            yield ids[0], ids[-1]
+            cursor = ids[-1]
+
+    def _report(self, diffs, options):
+        if options['dry_run'] or options['verbosity'] > 1:
+            for order_id, changes in diffs:
+                detail = ', '.join(f"{field}: {old} -> {new}" for field, (old, new) in changes.items())
+                self.stdout.write(f"Sipariş {order_id}: {detail}")
+        return len(diffs)
+
+    def _read_checkpoint(self):
+        if not self.checkpoint.exists():
+            return 0
+        return json.loads(self.checkpoint.read_text())['last_id']
+
+    def _write_checkpoint(self, last_id, options):
+        if self.checkpoint and not options['dry_run']:
+            self.checkpoint.write_text(json.dumps({'last_id': last_id}))
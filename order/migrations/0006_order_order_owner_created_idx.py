@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_company_company_owner_name_ci_uniq'),
+        ('order', '0005_order_discount_amount_order_global_discount_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['owner', '-created_at'], name='order_owner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from order.rollup import ROLLUP_VALUE_FIELDS, aggregate_lines
+
+
+def fill_rollup(apps, schema_editor):
+    # Mevcut siparişler ürün kırılımında görünsün; rollup.rebuild_rollup'ın
+    # geçmiş modellerle yazılmış hali
+    OrderItem = apps.get_model('order', 'OrderItem')
+    SalesRollup = apps.get_model('order', 'SalesRollup')
+    batch = []
+    for row in aggregate_lines(OrderItem.objects.all()).iterator(chunk_size=1000):
+        batch.append(SalesRollup(
+            owner_id=row['order__owner_id'],
+            company_id=row['order__company_id'],
+            product_id=row['product_id'],
+            day=row['day'],
+            **{field: row[f'sum_{field}'] for field in ROLLUP_VALUE_FIELDS},
+        ))
+        if len(batch) >= 1000:
+            SalesRollup.objects.bulk_create(batch)
+            batch = []
+    SalesRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_company_company_owner_name_ci_uniq'),
+        ('order', '0006_order_order_owner_created_idx'),
+        ('product', '0004_product_product_code_ci_uniq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.PositiveBigIntegerField(default=0)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('discount_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('vat_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='company.company')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='product.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'day'], name='sales_rollup_owner_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'company', 'product', 'day'), name='sales_rollup_key_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rollup, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,12 @@ class Order(models.Model):
     vat_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    class Meta:
+        indexes = [
+            # Kullanıcının siparişleri en yeniden eskiye listelenir
+            models.Index(fields=['owner', '-created_at'], name='order_owner_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.company.name} - {self.total}₺"
 
@@ -35,3 +41,88 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.product.name} x{self.quantity}"
+
+
+class SalesRollup(models.Model):
+    """
+    (kullanıcı, şirket, ürün, gün) bazında önceden toplanmış satış özeti.
+
+    Sipariş oluşturma / güncelleme / silme sırasında etkilenen anahtarlar
+    yeniden hesaplanır (bkz. order/rollup.py); `rebuild_sales_rollup`
+    komutu tabloyu sıfırdan oluşturur.
+    """
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    day = models.DateField()
+
+    quantity = models.PositiveBigIntegerField(default=0)
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    discount_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    vat_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'company', 'product', 'day'], name='sales_rollup_key_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['owner', 'day'], name='sales_rollup_owner_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.company_id}/{self.product_id}: {self.total}₺"
+
+
+class OrderRequest(models.Model):
+    """
+    Idempotency anahtarıyla gelen sipariş oluşturma isteği.
+
+    Aynı (kullanıcı, anahtar) ile tekrar gelen istekler sipariş oluşturmaz,
+    saklanan sonucu döndürür. Asenkron modda kayıt aynı zamanda kuyruk
+    işidir: `process_order_requests` komutu PENDING kayıtları işler
+    (bkz. order/jobs.py).
+    """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Bekliyor'),
+        (PROCESSING, 'İşleniyor'),
+        (SUCCEEDED, 'Tamamlandı'),
+        (FAILED, 'Hatalı'),
+    ]
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    idempotency_key = models.CharField(max_length=255)
+    payload = models.JSONField()
+    payload_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    order = models.ForeignKey(Order, null=True, blank=True, on_delete=models.SET_NULL)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'idempotency_key'], name='order_request_key_uniq'
+            ),
+        ]
+        indexes = [
+            # Kuyruk: en eski bekleyen işler
+            models.Index(fields=['status', 'id'], name='order_request_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.idempotency_key} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
@@ -0,0 +1,197 @@
+"""
+Sipariş tutarı hesaplama kuralları.
+
+API, admin ve toplu yeniden hesaplama işleri aynı kuralları kullanır:
+
+- kalem net tutarı = miktar × birim fiyat × (1 - kalem indirimi / 100),
+  2 basamağa yuvarlanır
+- ara toplam = kalem net tutarlarının toplamı
+- iskonto = ara toplam × genel iskonto / 100, 2 basamağa yuvarlanır
+- KDV = (ara toplam - iskonto) × KDV oranı / 100, 2 basamağa yuvarlanır
+- toplam = ara toplam - iskonto + KDV
+
+Python tarafında yuvarlama ROUND_HALF_UP'tır; PostgreSQL'deki
+ROUND(numeric, 2) ile aynı sonucu verir. SQLite ondalıkları float olarak
+işler, ROUND .xx5 sınırlarında bir kuruş farklı sonuç verebilir. Bu yüzden
+recalculate_in_db SQLite'ta Python hesaplamasına döner. Satış özeti
+(rollup.py) SQL'de toplandığından SQLite'ta aynı sınırlarda kuruş farkı
+gösterebilir.
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+from django.db import connections, transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round
+
+from .models import OrderItem
+
+TWO_PLACES = Decimal('0.01')
+ZERO = Decimal('0.00')
+
+# SQL'de yüzde hesaplarında `/ 100` yerine 0.01 ile çarpılır; SQLite tam sayı
+# değerli ondalıkları INTEGER sakladığı için bölme tam sayı bölmesine dönüşür
+PERCENT = Value(Decimal('0.01'))
+
+
+class OrderTotals(NamedTuple):
+    subtotal: Decimal
+    discount_amount: Decimal
+    vat_amount: Decimal
+    total: Decimal
+
+
+def quantize(value):
+    return Decimal(value).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+
+
+def line_net(quantity, unit_price, item_discount=ZERO):
+    """Kalem indirimi uygulanmış kalem tutarı"""
+    return quantize(quantity * unit_price * (100 - item_discount) / 100)
+
+
+def totals_from_subtotal(subtotal, global_discount, vat_rate):
+    discount_amount = quantize(subtotal * global_discount / 100)
+    vat_amount = quantize((subtotal - discount_amount) * vat_rate / 100)
+    return OrderTotals(
+        subtotal=subtotal,
+        discount_amount=discount_amount,
+        vat_amount=vat_amount,
+        total=subtotal - discount_amount + vat_amount,
+    )
+
+
+def calculate_totals(lines, global_discount, vat_rate):
+    """
+    Tek sipariş için tutarlar.
+
+    `lines`: quantity, unit_price ve (isteğe bağlı) item_discount anahtarlı sözlükler.
+    """
+    subtotal = sum(
+        (line_net(line['quantity'], line['unit_price'], line.get('item_discount', ZERO))
+         for line in lines),
+        ZERO,
+    )
+    return totals_from_subtotal(subtotal, global_discount, vat_rate)
+
+
+def calculate_totals_batch(orders, lines):
+    """
+    Çok sayıda sipariş için tek geçişte tutarlar.
+
+    `orders`: (order_id, global_discount, vat_rate) demetleri
+    `lines`: (order_id, quantity, unit_price, item_discount) demetleri
+
+    Model örneği oluşturmadan `values_list` çıktısıyla çalışır ve
+    {order_id: OrderTotals} döndürür. Kalemi olmayan siparişlerin ara toplamı 0'dır.
+    """
+    subtotals = defaultdict(lambda: ZERO)
+    for order_id, quantity, unit_price, item_discount in lines:
+        subtotals[order_id] += line_net(quantity, unit_price, item_discount)
+
+    return {
+        order_id: totals_from_subtotal(subtotals[order_id], global_discount, vat_rate)
+        for order_id, global_discount, vat_rate in orders
+    }
+
+
+def apply_totals(order, totals):
+    """Hesaplanan tutarları siparişe yaz (kaydetmez)"""
+    order.subtotal, order.discount_amount, order.vat_amount, order.total = totals
+
+
+def _amount():
+    return DecimalField(max_digits=12, decimal_places=2)
+
+
+def line_net_expression():
+    """OrderItem satırı üzerinde kalem net tutarı SQL ifadesi"""
+    return Round(
+        ExpressionWrapper(
+            F('quantity') * F('unit_price') * (100 - F('item_discount')) * PERCENT,
+            output_field=_amount(),
+        ),
+        2,
+    )
+
+
+def subtotal_expression():
+    """Order satırı için kalemlerden ara toplamı hesaplayan alt sorgu"""
+    return Coalesce(
+        Subquery(
+            OrderItem.objects.filter(order=OuterRef('pk'))
+            .values('order')
+            .annotate(subtotal=Sum(line_net_expression()))
+            .values('subtotal')
+        ),
+        Value(ZERO),
+        output_field=_amount(),
+    )
+
+
+def totals_expressions(subtotal=None, order_prefix=''):
+    """
+    Verilen ara toplam ifadesinden (varsayılan: kayıtlı `subtotal`) iskonto,
+    KDV ve toplamı hesaplayan SQL ifadeleri.
+
+    `order_prefix` iskonto / KDV oranlarının okunduğu ilişkidir; OrderItem
+    üzerinde `'order__'` verilir.
+    """
+    if subtotal is None:
+        subtotal = F('subtotal')
+    discount_amount = Round(
+        ExpressionWrapper(
+            subtotal * F(f'{order_prefix}global_discount') * PERCENT, output_field=_amount()
+        ),
+        2,
+    )
+    vat_amount = Round(
+        ExpressionWrapper(
+            (subtotal - discount_amount) * F(f'{order_prefix}vat_rate') * PERCENT,
+            output_field=_amount(),
+        ),
+        2,
+    )
+    return {
+        'discount_amount': discount_amount,
+        'vat_amount': vat_amount,
+        'total': ExpressionWrapper(subtotal - discount_amount + vat_amount, output_field=_amount()),
+    }
+
+
+def recalculate_in_db(queryset):
+    """
+    Verilen siparişlerin tutarlarını veritabanında yeniden hesapla.
+
+    Önce ara toplam kalemlerden yazılır, ardından diğer tutarlar bu yeni ara
+    toplamdan hesaplanır; alt sorgu her ifadede tekrarlanmaz.
+
+    SQLite'ta SQL yuvarlaması float olduğundan tutarlar Python'da
+    hesaplanıp bulk_update ile yazılır.
+    """
+    if connections[queryset.db].vendor == 'sqlite':
+        return _recalculate_in_python(queryset)
+    with transaction.atomic():
+        updated = queryset.update(subtotal=subtotal_expression())
+        queryset.update(**totals_expressions())
+    return updated
+
+
+def _recalculate_in_python(queryset):
+    orders = list(queryset.values_list('id', 'global_discount', 'vat_rate'))
+    computed = calculate_totals_batch(
+        orders,
+        OrderItem.objects.filter(order_id__in=queryset.values('pk'))
+        .values_list('order_id', 'quantity', 'unit_price', 'item_discount'),
+    )
+    changed = []
+    for order_id, totals in computed.items():
+        order = queryset.model(pk=order_id)
+        apply_totals(order, totals)
+        changed.append(order)
+    with transaction.atomic():
+        queryset.model.objects.bulk_update(
+            changed, ['subtotal', 'discount_amount', 'vat_amount', 'total'], batch_size=1000
+        )
+    return len(orders)
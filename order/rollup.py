@@ -0,0 +1,153 @@
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import DecimalField, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import OrderItem, SalesRollup
+from .pricing import line_net_expression, totals_expressions
+
+ROLLUP_UNIQUE_FIELDS = ['owner', 'company', 'product', 'day']
+ROLLUP_VALUE_FIELDS = ['quantity', 'subtotal', 'discount_amount', 'vat_amount', 'total']
+
+
+def _line_amounts():
+    """
+    Kalem bazlı tutarlar (ürün indirimi, genel iskonto ve KDV dağıtılmış).
+
+    Her kalemin iskonto ve KDV'si calculate_totals ile aynı ROUND_HALF_UP
+    kuralıyla kuruşa yuvarlanır. Sipariş iskontoyu ve KDV'yi ara toplamın
+    tamamı üzerinden bir kez yuvarladığından, ürün kırılımının toplamı
+    sipariş toplamlarından sipariş başına en fazla kalem sayısı kadar kuruş
+    sapabilir.
+    """
+    amount = DecimalField(max_digits=14, decimal_places=2)
+    subtotal = line_net_expression()
+    line = totals_expressions(subtotal, order_prefix='order__')
+    return {
+        'sum_quantity': Sum('quantity'),
+        'sum_subtotal': Sum(subtotal),
+        'sum_discount_amount': Sum(line['discount_amount'], output_field=amount),
+        'sum_vat_amount': Sum(line['vat_amount'], output_field=amount),
+        'sum_total': Sum(line['total'], output_field=amount),
+    }
+
+
+def aggregate_lines(items):
+    """OrderItem queryset'ini rollup anahtarına göre grupla"""
+    return (
+        items.annotate(day=TruncDate('order__created_at'))
+        .values('order__owner_id', 'order__company_id', 'product_id', 'day')
+        .annotate(**_line_amounts())
+        .order_by()
+    )
+
+
+def _to_rollup(row):
+    return SalesRollup(
+        owner_id=row['order__owner_id'],
+        company_id=row['order__company_id'],
+        product_id=row['product_id'],
+        day=row['day'],
+        **{field: row[f'sum_{field}'] for field in ROLLUP_VALUE_FIELDS},
+    )
+
+
+def order_keys(order, product_ids):
+    """Bir siparişin katkıda bulunduğu (şirket, ürün, gün) anahtarları"""
+    day = timezone.localdate(order.created_at)
+    return {(order.company_id, product_id, day) for product_id in product_ids}
+
+
+def _key_filter(keys):
+    return reduce(or_, (
+        Q(company_id=company_id, product_id=product_id, day=day)
+        for company_id, product_id, day in keys
+    ))
+
+
+@transaction.atomic(savepoint=False)
+def refresh_rollup(owner_id, keys):
+    """
+    Sadece verilen anahtarları kaynaktan yeniden hesapla.
+
+    Sipariş başına sabit sayıda sorgu çalışır (kilit için bir insert ve bir
+    select, bir aggregate, bir upsert, gerekiyorsa bir silme); kalem
+    sayısından bağımsızdır.
+
+    Aggregate'ten önce anahtarların rollup satırları oluşturulup kilitlenir.
+    Aynı anahtara yazan ikinci transaction kilitte bekler; READ COMMITTED'da
+    aggregate'i ilkinin commit ettiği kalemleri de görür, böylece eski bir
+    toplamla yenisinin üzerine yazamaz.
+    """
+    if not keys:
+        return
+
+    SalesRollup.objects.bulk_create(
+        [
+            SalesRollup(owner_id=owner_id, company_id=company_id, product_id=product_id, day=day)
+            for company_id, product_id, day in keys
+        ],
+        ignore_conflicts=True,
+    )
+    # Kilitler her zaman aynı sırayla alınır (deadlock olmasın)
+    list(
+        SalesRollup.objects.select_for_update()
+        .filter(owner_id=owner_id).filter(_key_filter(keys))
+        .order_by('company_id', 'product_id', 'day')
+        .values_list('pk', flat=True)
+    )
+
+    companies = {company_id for company_id, _, _ in keys}
+    products = {product_id for _, product_id, _ in keys}
+    days = {day for _, _, day in keys}
+
+    items = OrderItem.objects.filter(
+        order__owner_id=owner_id,
+        order__company_id__in=companies,
+        product_id__in=products,
+        order__created_at__date__in=days,
+    )
+    rows = [
+        row for row in aggregate_lines(items)
+        if (row['order__company_id'], row['product_id'], row['day']) in keys
+    ]
+
+    if rows:
+        SalesRollup.objects.bulk_create(
+            [_to_rollup(row) for row in rows],
+            update_conflicts=True,
+            unique_fields=ROLLUP_UNIQUE_FIELDS,
+            update_fields=ROLLUP_VALUE_FIELDS,
+        )
+
+    # Artık hiç kalemi kalmayan anahtarları sil
+    found = {(row['order__company_id'], row['product_id'], row['day']) for row in rows}
+    empty = keys - found
+    if empty:
+        SalesRollup.objects.filter(owner_id=owner_id).filter(_key_filter(empty)).delete()
+
+
+def rebuild_rollup(owner_id=None, batch_size=1000):
+    """Rollup tablosunu sıfırdan oluştur; işlenen satır sayısını döndürür"""
+    rollups = SalesRollup.objects.all()
+    items = OrderItem.objects.all()
+    if owner_id is not None:
+        rollups = rollups.filter(owner_id=owner_id)
+        items = items.filter(order__owner_id=owner_id)
+    rollups.delete()
+
+    batch = []
+    count = 0
+    for row in aggregate_lines(items).iterator(chunk_size=batch_size):
+        batch.append(_to_rollup(row))
+        if len(batch) >= batch_size:
+            SalesRollup.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        SalesRollup.objects.bulk_create(batch)
+        count += len(batch)
+    return count
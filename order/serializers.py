@@ -1,12 +1,23 @@
 from rest_framework import serializers
-from .models import Order, OrderItem
+from .models import Order, OrderItem, OrderRequest
 from product.models import Product
 from company.models import Company
+from collections import defaultdict
+from datetime import timedelta
 from decimal import Decimal
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.shortcuts import get_object_or_404
+from dashboard_project.filters import start_of_day
+from dashboard_project.serializers import EagerLoadingMixin, SparseFieldsMixin
+from .pricing import apply_totals, calculate_totals
+from .rollup import order_keys, refresh_rollup
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    # Ürün id'si sorgusuz kabul edilir; ürünler OrderSerializer.validate_items
+    # içinde tek sorguyla toplu olarak çözümlenir
+    product = serializers.IntegerField(source='product_id', min_value=1)
     product_name = serializers.ReadOnlyField(source='product.name')
     product_code = serializers.ReadOnlyField(source='product.code')
 
@@ -16,6 +27,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
             'id', 'product', 'product_name', 'product_code',
             'quantity', 'unit_price', 'item_discount'
         ]
+        select_related_fields = ['product']
 
     def validate_quantity(self, value):
         """Miktar validasyonu"""
@@ -42,7 +54,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
         return value
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True)
     company_name = serializers.ReadOnlyField(source='company.name')
 
@@ -58,11 +70,12 @@ class OrderSerializer(serializers.ModelSerializer):
             'id', 'created_at', 'owner',
             'subtotal', 'discount_amount', 'vat_amount', 'total'
         ]
+        select_related_fields = ['company']
 
     def validate_company(self, value):
         """Şirketin kullanıcıya ait olduğunu kontrol et"""
         user = self.context['request'].user
-        if value.owner != user:
+        if value.owner_id != user.pk:
             raise serializers.ValidationError("Bu şirket size ait değil.")
         return value
 
@@ -88,19 +101,29 @@ class OrderSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Sipariş en az bir ürün içermelidir.")
         
         user = self.context['request'].user
-        
+
+        # Tüm ürünleri tek sorguda, sadece kullanıcının ürünleri arasından çek
+        # PATCH'te DRF iç içe zorunlu alan kontrolünü atlar; ürün eksik olabilir
+        product_ids = {item['product_id'] for item in items_data if 'product_id' in item}
+        products = Product.objects.filter(owner=user, pk__in=product_ids).in_bulk()
+
+        line_errors = []
+        for item in items_data:
+            product_id = item.get('product_id')
+            if product_id is None:
+                line_errors.append({'product': ["Ürün belirtilmemiş."]})
+            elif product_id not in products:
+                line_errors.append({'product': ["Ürün bulunamadı veya size ait değil."]})
+            else:
+                line_errors.append({})
+        if any(line_errors):
+            raise serializers.ValidationError(line_errors)
+
+        for item in items_data:
+            item['product'] = products[item.pop('product_id')]
+
         for idx, item in enumerate(items_data, 1):
-            product = item.get('product')
-            
-            # Ürün kontrolü
-            if not product:
-                raise serializers.ValidationError(f"Ürün {idx}: Ürün belirtilmemiş.")
-            
-            # Ürün sahipliği kontrolü
-            if product.owner != user:
-                raise serializers.ValidationError(
-                    f"Ürün '{product.name}' size ait değil."
-                )
+            product = item['product']
             
             # Miktar kontrolü
             quantity = item.get('quantity')
@@ -138,69 +161,176 @@ class OrderSerializer(serializers.ModelSerializer):
         return items_data
 
     def _calculate_totals(self, order, items_data):
-        """Sipariş toplamlarını hesapla"""
-        subtotal = Decimal('0')
+        """Sipariş toplamlarını hesapla (kaydetmez, çağıran taraf kaydeder)"""
+        totals = calculate_totals(items_data, order.global_discount, order.vat_rate)
+        apply_totals(order, totals)
+
+    def _sync_items(self, order, items_data):
+        """Mevcut kalemleri gelen veriyle karşılaştır; sadece farkları yaz"""
+        existing_by_product = defaultdict(list)
+        for item in order.items.all():
+            existing_by_product[item.product_id].append(item)
 
-        # Ürün bazlı hesaplama
+        to_create = []
+        to_update = []
         for item_data in items_data:
-            quantity = item_data['quantity']
-            price = item_data['unit_price']
-            discount = item_data.get('item_discount', Decimal('0'))
-
-            # Ürün bazlı indirim hesapla
-            discounted_price = price - (price * discount / 100)
-            subtotal += discounted_price * quantity
-
-        # Genel iskonto ve KDV
-        general_discount = order.global_discount
-        discount_amount = subtotal * general_discount / 100
-        discounted_total = subtotal - discount_amount
-        vat_amount = discounted_total * order.vat_rate / 100
-        total = discounted_total + vat_amount
-
-        # Değerleri güncelle
-        order.subtotal = subtotal
-        order.discount_amount = discount_amount
-        order.vat_amount = vat_amount
-        order.total = total
-        order.save()
+            candidates = existing_by_product.get(item_data['product'].pk)
+            if not candidates:
+                to_create.append(OrderItem(order=order, **item_data))
+                continue
+
+            item = candidates.pop(0)
+            changed = False
+            for field in ('quantity', 'unit_price', 'item_discount'):
+                value = item_data.get(field, OrderItem._meta.get_field(field).default)
+                if getattr(item, field) != value:
+                    setattr(item, field, value)
+                    changed = True
+            if changed:
+                to_update.append(item)
+
+        stale_ids = [item.pk for items in existing_by_product.values() for item in items]
+        if stale_ids:
+            OrderItem.objects.filter(pk__in=stale_ids).delete()
+        if to_update:
+            OrderItem.objects.bulk_update(to_update, ['quantity', 'unit_price', 'item_discount'])
+        if to_create:
+            OrderItem.objects.bulk_create(to_create)
 
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items')
         user = self.context['request'].user
         validated_data.pop('owner', None)
-        order = Order.objects.create(owner=user, **validated_data)
 
-        # Ürünleri kaydet
-        for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
-
-        # Toplamları hesapla
+        # Toplamları insert'ten önce hesapla; sipariş satırı tek seferde yazılır
+        order = Order(owner=user, **validated_data)
         self._calculate_totals(order, items_data)
+        order.save()
+
+        # Ürünleri toplu kaydet
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=order, **item_data) for item_data in items_data]
+        )
+
+        # Satış özetini (rollup) sadece bu siparişin anahtarları için güncelle
+        refresh_rollup(user.pk, order_keys(order, [d['product'].pk for d in items_data]))
+
+        # Yanıt için kalemleri ürünleriyle birlikte tek sorguda yükle
+        items_queryset = OrderItemSerializer.setup_eager_loading(OrderItem.objects.all())
+        prefetch_related_objects([order], Prefetch('items', queryset=items_queryset))
 
         return order
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Sipariş güncelleme"""
         items_data = validated_data.pop('items', None)
+
+        # Değişiklikten önceki rollup anahtarları (şirket veya ürünler değişebilir)
+        old_keys = order_keys(instance, [item.product_id for item in instance.items.all()])
         
         # Order alanlarını güncelle
         instance.company = validated_data.get('company', instance.company)
         instance.delivery_date = validated_data.get('delivery_date', instance.delivery_date)
         instance.global_discount = validated_data.get('global_discount', instance.global_discount)
         instance.vat_rate = validated_data.get('vat_rate', instance.vat_rate)
-        instance.save()
 
-        # Eğer items güncellenmişse
         if items_data is not None:
-            # Eski itemları sil
-            instance.items.all().delete()
-            
-            # Yeni itemları ekle
-            for item_data in items_data:
-                OrderItem.objects.create(order=instance, **item_data)
-            
-            # Toplamları yeniden hesapla
-            self._calculate_totals(instance, items_data)
-        
+            # Sadece değişen kalemleri yaz (sil + yeniden ekle yerine)
+            self._sync_items(instance, items_data)
+            product_ids = [item_data['product'].pk for item_data in items_data]
+        else:
+            # İskonto / KDV değişmiş olabilir; mevcut kalemlerle yeniden hesapla
+            items_data = list(
+                instance.items.values('product_id', 'quantity', 'unit_price', 'item_discount')
+            )
+            product_ids = [item_data['product_id'] for item_data in items_data]
+
+        # Toplamları yeniden hesapla ve siparişi tek seferde kaydet
+        self._calculate_totals(instance, items_data)
+        instance.save()
+
+        refresh_rollup(instance.owner_id, old_keys | order_keys(instance, product_ids))
+
         return instance
+
+
+class OrderListSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    """
+    Sipariş tablosu için düz özet; kalemler yüklenmez.
+
+    Kalemler gerekiyorsa liste `?expand=items` ile OrderSerializer'a geçer.
+    """
+    company_name = serializers.ReadOnlyField(source='company.name')
+
+    class Meta:
+        model = Order
+        fields = ['id', 'company', 'company_name', 'delivery_date', 'created_at', 'total']
+        read_only_fields = fields
+        select_related_fields = ['company']
+        only_fields = [
+            'id', 'company_id', 'company__name', 'delivery_date', 'created_at', 'total',
+        ]
+
+
+class OrderRequestSerializer(serializers.ModelSerializer):
+    """Idempotent / asenkron sipariş isteğinin durumu"""
+    result = serializers.JSONField(source='response_body', read_only=True)
+
+    class Meta:
+        model = OrderRequest
+        fields = [
+            'id', 'idempotency_key', 'status', 'order', 'response_status', 'result',
+            'created_at', 'completed_at',
+        ]
+        read_only_fields = fields
+
+
+class OrderExportQuerySerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=['csv', 'jsonl', 'xlsx'], default='csv')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    company = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        date_from = attrs.get('date_from')
+        date_to = attrs.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError("Başlangıç tarihi bitiş tarihinden sonra olamaz.")
+        return attrs
+
+
+class OrderFilterSerializer(serializers.Serializer):
+    """Sipariş listesi filtreleri; tümü SQL koşullarına çevrilir"""
+    company = serializers.IntegerField(required=False, min_value=1)
+    delivery_date_after = serializers.DateField(required=False)
+    delivery_date_before = serializers.DateField(required=False)
+    created_after = serializers.DateField(required=False)
+    created_before = serializers.DateField(required=False)
+    total_min = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    total_max = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+
+    LOOKUPS = {
+        'company': 'company_id',
+        'delivery_date_after': 'delivery_date__gte',
+        'delivery_date_before': 'delivery_date__lte',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lt',
+        'total_min': 'total__gte',
+        'total_max': 'total__lte',
+    }
+
+    def validate(self, attrs):
+        # Günler indeksi kullanabilen datetime sınırlarına çevrilir (bitiş hariç)
+        if 'created_after' in attrs:
+            attrs['created_after'] = start_of_day(attrs['created_after'])
+        if 'created_before' in attrs:
+            attrs['created_before'] = start_of_day(attrs['created_before'] + timedelta(days=1))
+        return attrs
+
+    def filter_queryset(self, queryset):
+        filters = {
+            self.LOOKUPS[name]: value for name, value in self.validated_data.items()
+        }
+        return queryset.filter(**filters)
@@ -0,0 +1,33 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import Order
+from .rollup import order_keys, refresh_rollup
+
+
+def _deleted_directly(origin):
+    # Şirket / kullanıcı silinirken siparişlerle birlikte rollup satırları da
+    # cascade ile silinir; yeniden hesaplamak silinen şirkete satır yazar
+    if isinstance(origin, QuerySet):
+        return origin.model is Order
+    return isinstance(origin, Order)
+
+
+@receiver(pre_delete, sender=Order)
+def remember_rollup_keys(sender, instance, origin=None, **kwargs):
+    """Kalemler silinmeden önce siparişin rollup anahtarlarını topla"""
+    if _deleted_directly(origin):
+        product_ids = instance.items.values_list('product_id', flat=True)
+        instance._rollup_keys = order_keys(instance, product_ids)
+
+
+@receiver(post_delete, sender=Order)
+def refresh_deleted_order_rollup(sender, instance, **kwargs):
+    """
+    Silinen siparişin anahtarlarını yeniden hesapla; API, admin ve queryset
+    `.delete()` silmelerinin hepsi buradan geçer.
+    """
+    keys = getattr(instance, '_rollup_keys', None)
+    if keys:
+        refresh_rollup(instance.owner_id, keys)
@@ -1,3 +1,658 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from company.models import Company
+from product.models import Product
+from .models import Order, OrderItem, OrderRequest, SalesRollup
+from . import pricing
+from .pricing import calculate_totals, calculate_totals_batch, recalculate_in_db
+from .rollup import order_keys, refresh_rollup
+
+User = get_user_model()
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class OrderListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+
+    def _create_orders(self, count, items_per_order=3):
+        start = Order.objects.count()
+        for i in range(start, start + count):
+            company = Company.objects.create(name=f'Şirket {i}', owner=self.user)
+            order = Order.objects.create(company=company, owner=self.user)
+            for j in range(items_per_order):
+                product = Product.objects.create(
+                    code=f'P-{i}-{j}', name=f'Ürün {i}-{j}',
+                    price=Decimal('10.00'), owner=self.user,
+                )
+                OrderItem.objects.create(
+                    order=order, product=product, quantity=1, unit_price=Decimal('10.00')
+                )
+
+    def test_list_query_count_is_constant(self):
+        self._create_orders(2)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/orders/')
+        self.assertEqual(response.status_code, 200)
+
+        self._create_orders(10)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/orders/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('items', response.data['results'][0])
+
+    def test_list_expand_items(self):
+        self._create_orders(3)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/orders/', {'expand': 'items'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results'][0]['items']), 3)
+
+    def test_sparse_fields(self):
+        self._create_orders(1)
+        response = self.client.get('/api/orders/', {'fields': 'id,total'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'total'})
+
+        order = Order.objects.get()
+        response = self.client.get(f'/api/orders/{order.pk}/', {'fields': 'id,company_name'})
+        self.assertEqual(response.data, {'id': order.pk, 'company_name': 'Şirket 0'})
+
+        response = self.client.get('/api/orders/', {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.data)
+
+    def test_retrieve_query_count(self):
+        self._create_orders(1, items_per_order=5)
+        order = Order.objects.get()
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/orders/{order.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['items']), 5)
+        self.assertEqual(response.data['items'][0]['product_code'], 'P-0-0')
+
+    def test_list_is_cursor_paginated(self):
+        self._create_orders(5, items_per_order=1)
+        seen = []
+        url = '/api/orders/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(order['id'] for order in response.data['results'])
+            url = response.data['next']
+        expected = list(
+            Order.objects.order_by('-created_at', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+
+class OrderFixturesMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+        self.company = Company.objects.create(name='Şirket', owner=self.user)
+        self.products = [
+            Product.objects.create(
+                code=f'P-{i}', name=f'Ürün {i}', price=Decimal('10.00'), owner=self.user
+            )
+            for i in range(3)
+        ]
+
+    def _payload(self, lines, **extra):
+        payload = {
+            'company': self.company.pk,
+            'global_discount': '10.00',
+            'vat_rate': '20.00',
+            'items': [
+                {'product': product.pk, 'quantity': quantity, 'unit_price': '10.00'}
+                for product, quantity in lines
+            ],
+        }
+        payload.update(extra)
+        return payload
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class OrderWriteTests(OrderFixturesMixin, APITestCase):
+    def test_create_writes_order_and_items_once(self):
+        payload = self._payload([(product, 2) for product in self.products])
+        response = self.client.post('/api/orders/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+        order = Order.objects.get()
+        self.assertEqual(order.items.count(), 3)
+        self.assertEqual(order.subtotal, Decimal('60.00'))
+        self.assertEqual(order.discount_amount, Decimal('6.00'))
+        self.assertEqual(order.vat_amount, Decimal('10.80'))
+        self.assertEqual(order.total, Decimal('64.80'))
+
+    def test_update_diffs_existing_items(self):
+        payload = self._payload([(self.products[0], 1), (self.products[1], 1)])
+        response = self.client.post('/api/orders/', payload, format='json')
+        order_id = response.data['id']
+        kept_id = OrderItem.objects.get(product=self.products[0]).pk
+
+        payload = self._payload([(self.products[0], 5), (self.products[2], 1)])
+        response = self.client.put(f'/api/orders/{order_id}/', payload, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+        items = {item.product_id: item for item in OrderItem.objects.filter(order_id=order_id)}
+        self.assertEqual(set(items), {self.products[0].pk, self.products[2].pk})
+        self.assertEqual(items[self.products[0].pk].pk, kept_id)
+        self.assertEqual(items[self.products[0].pk].quantity, 5)
+        self.assertEqual(Order.objects.get().subtotal, Decimal('60.00'))
+
+    def test_partial_update_recalculates_totals(self):
+        payload = self._payload([(self.products[0], 1)])
+        order_id = self.client.post('/api/orders/', payload, format='json').data['id']
+
+        response = self.client.patch(
+            f'/api/orders/{order_id}/', {'global_discount': '0.00'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(Order.objects.get().total, Decimal('12.00'))
+
+    def test_create_query_count_does_not_grow_with_lines(self):
+        extra = [
+            Product.objects.create(
+                code=f'X-{i}', name=f'Ek {i}', price=Decimal('1.00'), owner=self.user
+            )
+            for i in range(20)
+        ]
+        counts = []
+        for products in (self.products[:2], self.products + extra):
+            payload = self._payload([(product, 1) for product in products])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/orders/', payload, format='json')
+            self.assertEqual(response.status_code, 201, response.data)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_foreign_product_reports_line_error(self):
+        other = User.objects.create_user(username='other', password='Secret123!')
+        foreign = Product.objects.create(
+            code='F-1', name='Yabancı', price=Decimal('10.00'), owner=other
+        )
+        payload = self._payload([(self.products[0], 1), (foreign, 1)])
+        payload['items'].append({'product': 999999, 'quantity': 1, 'unit_price': '10.00'})
+
+        response = self.client.post('/api/orders/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['items']
+        self.assertEqual(errors[0], {})
+        self.assertIn('product', errors[1])
+        self.assertIn('product', errors[2])
+        self.assertFalse(Order.objects.exists())
+
+    def test_patch_line_without_product_is_rejected(self):
+        payload = self._payload([(self.products[0], 1)])
+        order_id = self.client.post('/api/orders/', payload, format='json').data['id']
+
+        response = self.client.patch(
+            f'/api/orders/{order_id}/',
+            {'items': [{'quantity': 2, 'unit_price': '10.00'}]}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['items'], [{'product': ["Ürün belirtilmemiş."]}])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class SalesRollupTests(OrderFixturesMixin, APITestCase):
+    def _rollup(self):
+        return {
+            row.product_id: (row.quantity, row.subtotal, row.total)
+            for row in SalesRollup.objects.all()
+        }
+
+    def test_rollup_follows_order_changes(self):
+        payload = self._payload([(self.products[0], 2), (self.products[1], 1)])
+        order_id = self.client.post('/api/orders/', payload, format='json').data['id']
+        self.assertEqual(self._rollup(), {
+            self.products[0].pk: (2, Decimal('20.00'), Decimal('21.60')),
+            self.products[1].pk: (1, Decimal('10.00'), Decimal('10.80')),
+        })
+
+        payload = self._payload([(self.products[0], 1), (self.products[2], 3)])
+        self.client.put(f'/api/orders/{order_id}/', payload, format='json')
+        self.assertEqual(self._rollup(), {
+            self.products[0].pk: (1, Decimal('10.00'), Decimal('10.80')),
+            self.products[2].pk: (3, Decimal('30.00'), Decimal('32.40')),
+        })
+
+        self.client.delete(f'/api/orders/{order_id}/')
+        self.assertFalse(SalesRollup.objects.exists())
+
+    def test_rollup_rounds_each_line_like_order_totals(self):
+        payload = self._payload([(self.products[0], 1)])
+        payload['items'][0]['unit_price'] = '0.35'
+        self.client.post('/api/orders/', payload, format='json')
+        order = Order.objects.get()
+        row = SalesRollup.objects.get()
+        # 0.35 × %10 = 0.035 -> 0.04 ; (0.35 - 0.04) × %20 = 0.062 -> 0.06
+        self.assertEqual((row.discount_amount, row.vat_amount, row.total), (
+            order.discount_amount, order.vat_amount, order.total,
+        ))
+        self.assertEqual(row.total, Decimal('0.37'))
+
+    def test_queryset_delete_refreshes_rollup(self):
+        for quantity in (1, 2):
+            self.client.post('/api/orders/', self._payload([(self.products[0], quantity)]), format='json')
+        Order.objects.filter(items__quantity=1).delete()
+        self.assertEqual(self._rollup(), {self.products[0].pk: (2, Decimal('20.00'), Decimal('21.60'))})
+
+    def test_company_delete_removes_rollup(self):
+        self.client.post('/api/orders/', self._payload([(self.products[0], 1)]), format='json')
+        self.company.delete()
+        self.assertFalse(SalesRollup.objects.exists())
+        self.assertFalse(Order.objects.exists())
+
+    def test_rebuild_command_matches_incremental_rollup(self):
+        for quantity in (1, 4):
+            payload = self._payload([(product, quantity) for product in self.products])
+            self.client.post('/api/orders/', payload, format='json')
+        incremental = self._rollup()
+
+        SalesRollup.objects.all().delete()
+        call_command('rebuild_sales_rollup', stdout=StringIO())
+        self.assertEqual(self._rollup(), incremental)
+        self.assertEqual(incremental[self.products[0].pk][0], 5)
+
+    def test_migration_fills_rollup_for_existing_orders(self):
+        migration = import_module('order.migrations.0007_salesrollup')
+        for quantity in (1, 4):
+            payload = self._payload([(product, quantity) for product in self.products])
+            self.client.post('/api/orders/', payload, format='json')
+        incremental = self._rollup()
+
+        SalesRollup.objects.all().delete()
+        migration.fill_rollup(django_apps, None)
+        self.assertEqual(self._rollup(), incremental)
+
+
+@skipUnless(connection.features.has_select_for_update, "SELECT ... FOR UPDATE gerekir")
+class SalesRollupConcurrencyTests(OrderFixturesMixin, APITransactionTestCase):
+    def test_overlapping_writes_keep_both_orders(self):
+        first_refreshed = threading.Event()
+        release_first = threading.Event()
+        errors = []
+
+        def write(quantity, hold):
+            try:
+                with transaction.atomic():
+                    order = Order.objects.create(owner=self.user, company=self.company)
+                    OrderItem.objects.create(
+                        order=order, product=self.products[0],
+                        quantity=quantity, unit_price=Decimal('10.00'),
+                    )
+                    refresh_rollup(self.user.pk, order_keys(order, [self.products[0].pk]))
+                    if hold:
+                        first_refreshed.set()
+                        release_first.wait(5)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=write, args=(2, True))
+        first.start()
+        self.assertTrue(first_refreshed.wait(5))
+        second = threading.Thread(target=write, args=(3, False))
+        second.start()
+        # İkinci yazım, ilki commit edene kadar rollup kilidinde bekler
+        second.join(0.5)
+        self.assertTrue(second.is_alive())
+        release_first.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(SalesRollup.objects.get().quantity, 5)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class OrderExportTests(OrderFixturesMixin, APITestCase):
+    def _read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_csv_export_has_one_row_per_line(self):
+        for quantity in (1, 2):
+            payload = self._payload([(product, quantity) for product in self.products])
+            self.client.post('/api/orders/', payload, format='json')
+
+        response = self.client.get('/api/orders/export/')
+        with self.assertNumQueries(2):
+            lines = self._read(response)
+        self.assertEqual(len(lines), 1 + 6)
+        self.assertTrue(lines[0].startswith('order_id,created_at'))
+        self.assertIn('P-0,Ürün 0,1,10.00,0.00', lines[1])
+
+    def test_filters_are_applied(self):
+        other_company = Company.objects.create(name='Diğer', owner=self.user)
+        self.client.post('/api/orders/', self._payload([(self.products[0], 1)]), format='json')
+        self.client.post(
+            '/api/orders/',
+            self._payload([(self.products[1], 1)], company=other_company.pk),
+            format='json',
+        )
+
+        lines = self._read(self.client.get(
+            '/api/orders/export/', {'type': 'jsonl', 'company': other_company.pk}
+        ))
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"company_name": "Diğer"', lines[0])
+
+        lines = self._read(self.client.get('/api/orders/export/', {'date_to': '2000-01-01'}))
+        self.assertEqual(len(lines), 1)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class OrderFilterTests(OrderFixturesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_company = Company.objects.create(name='Diğer', owner=self.user)
+        for company, quantity in ((self.company, 1), (self.other_company, 5), (self.company, 3)):
+            self.client.post(
+                '/api/orders/',
+                self._payload([(self.products[0], quantity)], company=company.pk),
+                format='json',
+            )
+
+    def _ids(self, params):
+        response = self.client.get('/api/orders/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [order['id'] for order in response.data['results']]
+
+    def test_filters_are_combined(self):
+        orders = Order.objects.filter(company=self.company)
+        self.assertCountEqual(
+            self._ids({'company': self.company.pk}), orders.values_list('id', flat=True)
+        )
+        self.assertEqual(
+            self._ids({'company': self.company.pk, 'total_min': '30.00'}),
+            list(orders.filter(total__gte=30).values_list('id', flat=True)),
+        )
+        self.assertEqual(self._ids({'created_before': '2000-01-01'}), [])
+
+    def test_created_filters_use_local_day_bounds(self):
+        # Yerel 23:30 (UTC 20:30) o güne aittir; sütun üzerinde tarih dönüşümü yapılmaz
+        order = Order.objects.earliest('id')
+        Order.objects.filter(pk=order.pk).update(
+            created_at=datetime(2025, 3, 10, 20, 30, tzinfo=dt_timezone.utc)
+        )
+        day = {'created_after': '2025-03-10', 'created_before': '2025-03-10'}
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._ids(day), [order.pk])
+        self.assertNotIn('django_datetime_cast_date', queries[-1]['sql'])
+        self.assertEqual(self._ids({'created_before': '2025-03-09'}), [])
+        self.assertNotIn(order.pk, self._ids({'created_after': '2025-03-11'}))
+
+    def test_ordering_by_total_is_paginated(self):
+        seen = []
+        url = '/api/orders/?ordering=-total&page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen.extend(order['id'] for order in response.data['results'])
+            url = response.data['next']
+        expected = list(Order.objects.order_by('-total', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_filter_returns_400(self):
+        response = self.client.get('/api/orders/', {'total_min': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('total_min', response.data)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class IdempotentOrderCreateTests(OrderFixturesMixin, APITestCase):
+    def _post(self, payload, key='key-1', **headers):
+        return self.client.post(
+            '/api/orders/', payload, format='json', HTTP_IDEMPOTENCY_KEY=key, **headers
+        )
+
+    def test_replay_returns_original_response(self):
+        payload = self._payload([(self.products[0], 2)])
+        first = self._post(payload)
+        self.assertEqual(first.status_code, 201, first.data)
+
+        with self.assertNumQueries(1):
+            second = self._post(payload)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reuse_with_different_payload(self):
+        self._post(self._payload([(self.products[0], 2)]))
+        response = self._post(self._payload([(self.products[0], 3)]))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_validation_errors_are_replayed(self):
+        payload = self._payload([(self.products[0], 0)])
+        self.assertEqual(self._post(payload).status_code, 400)
+        self.assertEqual(self._post(payload).status_code, 400)
+        self.assertEqual(OrderRequest.objects.get().status, OrderRequest.FAILED)
+
+    @override_settings(ORDER_ASYNC_CREATE=True)
+    def test_async_create_is_processed_by_worker(self):
+        payload = self._payload([(product, 1) for product in self.products])
+        response = self._post(payload, HTTP_PREFER='respond-async')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], OrderRequest.PENDING)
+        self.assertFalse(Order.objects.exists())
+
+        status_url = response['Location']
+        self.assertEqual(self._post(payload, HTTP_PREFER='respond-async').status_code, 202)
+
+        call_command('process_order_requests', '--once', stdout=StringIO())
+        order = Order.objects.get()
+        self.assertEqual(order.items.count(), 3)
+
+        response = self.client.get(status_url)
+        self.assertEqual(response.data['status'], OrderRequest.SUCCEEDED)
+        self.assertEqual(response.data['order'], order.pk)
+        self.assertEqual(response.data['result']['total'], str(order.total))
+
+        replay = self._post(payload, HTTP_PREFER='respond-async')
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.data['id'], order.pk)
+
+        call_command('process_order_requests', '--once', stdout=StringIO())
+        self.assertEqual(Order.objects.count(), 1)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class OrderAsyncViewTests(OrderFixturesMixin, APITransactionTestCase):
+    # Async view'lar sorguları ayrı thread'lerin bağlantılarında çalıştırır;
+    # verinin görünmesi için commit edilmiş olması gerekir
+    def setUp(self):
+        super().setUp()
+        for quantity in range(1, 6):
+            order = Order.objects.create(company=self.company, owner=self.user)
+            OrderItem.objects.create(
+                order=order, product=self.products[0], quantity=quantity,
+                unit_price=Decimal('10.00'),
+            )
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    async def _get(self, url, **params):
+        return await self.async_client.get(url, params, headers=self.auth)
+
+    async def test_list_pages_match_sync_ordering(self):
+        seen = []
+        response = await self._get('/api/async/orders/', page_size=2)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen.extend(order['id'] for order in data['results'])
+            if not data['next']:
+                break
+            response = await self.async_client.get(data['next'], headers=self.auth)
+        expected = [
+            pk async for pk in
+            Order.objects.order_by('-created_at', 'id').values_list('id', flat=True)
+        ]
+        self.assertEqual(seen, expected)
+        self.assertNotIn('items', data['results'][0])
+
+    async def test_retrieve_and_expand(self):
+        order = await Order.objects.order_by('id').afirst()
+        response = await self._get(f'/api/async/orders/{order.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['items'][0]['product_code'], 'P-0')
+
+        response = await self._get('/api/async/orders/', expand='items', fields='id,items')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'items'})
+
+    async def test_errors(self):
+        response = await self.async_client.get('/api/async/orders/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+        other = await User.objects.acreate(username='other')
+        order = await Order.objects.order_by('id').afirst()
+        token = AccessToken.for_user(other)
+        response = await self.async_client.get(
+            f'/api/async/orders/{order.pk}/', headers={'Authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = await self._get('/api/async/orders/', total_min='abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('total_min', response.json())
+        response = await self._get('/api/async/orders/', cursor='bozuk')
+        self.assertEqual(response.status_code, 404)
+
+
+class PricingTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='tester', password='Secret123!')
+        company = Company.objects.create(name='Şirket', owner=user)
+        product = Product.objects.create(code='P-1', name='Ürün', price=Decimal('1.00'), owner=user)
+        self.order = Order.objects.create(
+            company=company, owner=user,
+            global_discount=Decimal('7.50'), vat_rate=Decimal('18.00'),
+        )
+        self.lines = [
+            {'quantity': 3, 'unit_price': Decimal('19.99'), 'item_discount': Decimal('12.50')},
+            {'quantity': 7, 'unit_price': Decimal('0.35'), 'item_discount': Decimal('0.00')},
+        ]
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=self.order, product=product, **line) for line in self.lines]
+        )
+
+    def test_rounding_rules(self):
+        totals = calculate_totals(self.lines, Decimal('7.50'), Decimal('18.00'))
+        # 3 × 19.99 × 0.875 = 52.47375 -> 52.47 ; 7 × 0.35 = 2.45
+        self.assertEqual(totals.subtotal, Decimal('54.92'))
+        self.assertEqual(totals.discount_amount, Decimal('4.12'))
+        self.assertEqual(totals.vat_amount, Decimal('9.14'))
+        self.assertEqual(totals.total, Decimal('59.94'))
+
+    def test_batch_and_sql_match_single_order(self):
+        expected = calculate_totals(self.lines, Decimal('7.50'), Decimal('18.00'))
+        batch = calculate_totals_batch(
+            Order.objects.values_list('id', 'global_discount', 'vat_rate'),
+            OrderItem.objects.values_list('order_id', 'quantity', 'unit_price', 'item_discount'),
+        )
+        self.assertEqual(batch[self.order.pk], expected)
+
+        self.assertEqual(recalculate_in_db(Order.objects.filter(pk=self.order.pk)), 1)
+        self.order.refresh_from_db()
+        self.assertEqual(
+            (self.order.subtotal, self.order.discount_amount, self.order.vat_amount, self.order.total),
+            tuple(expected),
+        )
+
+    def _recalculate_at_cent_boundary(self):
+        # 10.05 × %50 = 5.025 -> 5.03 (ROUND_HALF_UP)
+        self.order.global_discount = Decimal('50.00')
+        self.order.save(update_fields=['global_discount'])
+        OrderItem.objects.filter(order=self.order).delete()
+        OrderItem.objects.create(
+            order=self.order, product=Product.objects.get(), quantity=1, unit_price=Decimal('10.05'),
+        )
+        with patch.object(
+            pricing, '_recalculate_in_python', wraps=pricing._recalculate_in_python,
+        ) as python_path:
+            recalculate_in_db(Order.objects.filter(pk=self.order.pk))
+        self.order.refresh_from_db()
+        expected = calculate_totals(
+            [{'quantity': 1, 'unit_price': Decimal('10.05'), 'item_discount': Decimal('0.00')}],
+            Decimal('50.00'), Decimal('18.00'),
+        )
+        self.assertEqual(expected.discount_amount, Decimal('5.03'))
+        self.assertEqual(
+            (self.order.subtotal, self.order.discount_amount, self.order.vat_amount, self.order.total),
+            tuple(expected),
+        )
+        return python_path
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite'a özgü Python yolu")
+    def test_sqlite_falls_back_to_python_rounding(self):
+        self.assertTrue(self._recalculate_at_cent_boundary().called)
+
+    @skipUnless(connection.vendor == 'postgresql', "ROUND(numeric) için PostgreSQL gerekir")
+    def test_sql_expressions_round_half_up_at_cent_boundary(self):
+        self.assertFalse(self._recalculate_at_cent_boundary().called)
+
+
+class RecalculateOrderTotalsCommandTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='tester', password='Secret123!')
+        company = Company.objects.create(name='Şirket', owner=user)
+        product = Product.objects.create(code='P-1', name='Ürün', price=Decimal('1.00'), owner=user)
+        self.orders = []
+        for _ in range(5):
+            order = Order.objects.create(company=company, owner=user, global_discount=Decimal('10.00'))
+            OrderItem.objects.create(order=order, product=product, quantity=2, unit_price=Decimal('5.00'))
+            self.orders.append(order)
+        recalculate_in_db(Order.objects.all())
+        # İlk ve son siparişin kayıtlı tutarlarını boz
+        Order.objects.filter(pk__in=[self.orders[0].pk, self.orders[-1].pk]).update(total=Decimal('1.00'))
+
+    def _call(self, *args):
+        out = StringIO()
+        call_command('recalculate_order_totals', '--batch-size=2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_reports_without_writing(self):
+        output = self._call('--dry-run')
+        self.assertIn(f"Sipariş {self.orders[0].pk}: total: 1.00 -> 10.80", output)
+        self.assertIn("2 sipariş değişecek.", output)
+        self.assertEqual(Order.objects.filter(total=Decimal('1.00')).count(), 2)
+
+    def test_updates_changed_orders(self):
+        for method in ('python', 'sql'):
+            Order.objects.update(total=Decimal('1.00'))
+            self._call(f'--method={method}')
+            self.assertFalse(Order.objects.exclude(total=Decimal('10.80')).exists())
+
+    def test_resume_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Path(directory) / 'checkpoint.json'
+            checkpoint.write_text(json.dumps({'last_id': self.orders[0].pk}))
+            output = self._call(f'--checkpoint={checkpoint}', '--resume')
+            self.assertIn("1 sipariş güncellendi.", output)
+            self.assertEqual(json.loads(checkpoint.read_text())['last_id'], self.orders[-1].pk)
+        self.assertEqual(Order.objects.get(pk=self.orders[0].pk).total, Decimal('1.00'))
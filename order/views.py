@@ -1,13 +1,113 @@
-from rest_framework import viewsets, permissions
-from .models import Order
-from .serializers import OrderSerializer
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status, viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from . import jobs
+from .models import Order, OrderRequest
+from .serializers import (
+    OrderExportQuerySerializer, OrderFilterSerializer, OrderListSerializer, OrderRequestSerializer,
+    OrderSerializer,
+)
+from .export import csv_stream, export_queryset, iter_orders, jsonl_stream, xlsx_file
+from dashboard_project.filters import QueryParamFilterBackend, StableOrderingFilter
+from dashboard_project.pagination import OrderCursorPagination
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderCursorPagination
+    filter_backends = [QueryParamFilterBackend, StableOrderingFilter]
+    filter_serializer_class = OrderFilterSerializer
+    ordering_fields = ['created_at', 'delivery_date', 'total']
+
+    def get_serializer_class(self):
+        # Liste varsayılan olarak düz özet döner; kalemler `?expand=items` ile gelir
+        if self.action == 'list' and 'items' not in self._expand():
+            return OrderListSerializer
+        return OrderSerializer
+
+    def _expand(self):
+        value = self.request.query_params.get('expand', '')
+        return {name.strip() for name in value.split(',')}
 
     def get_queryset(self):
-        return Order.objects.filter(owner=self.request.user).order_by('-created_at')
+        queryset = Order.objects.filter(owner=self.request.user).order_by('-created_at', 'id')
+        # Serializer'ın bildirdiği ilişkileri tek seferde yükle (N+1 önlemi)
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+    def create(self, request, *args, **kwargs):
+        """
+        `Idempotency-Key` başlığı varsa aynı anahtarla gelen tekrarlar yeni
+        sipariş oluşturmaz, ilk sonucu döndürür. ORDER_ASYNC_CREATE açıkken
+        `Prefer: respond-async` ile istek kuyruğa alınır ve 202 döner.
+        """
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > 255:
+            raise ValidationError({'Idempotency-Key': ["1-255 karakter olmalı."]})
+
+        run_async = (
+            settings.ORDER_ASYNC_CREATE
+            and 'respond-async' in request.headers.get('Prefer', '')
+        )
+        order_request, created = jobs.submit(request.user, key, request.data, run_async)
+        if not created and order_request.payload_hash != jobs.payload_hash(request.data):
+            return Response(
+                {'detail': "Bu Idempotency-Key farklı bir istek için kullanılmış."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        headers = {} if created else {'Idempotent-Replayed': 'true'}
+        if not order_request.is_finished:
+            headers['Location'] = reverse(
+                'order-request-status', kwargs={'request_id': order_request.pk}, request=request
+            )
+            return Response(
+                OrderRequestSerializer(order_request).data,
+                status=status.HTTP_202_ACCEPTED,
+                headers=headers,
+            )
+        return Response(
+            order_request.response_body, status=order_request.response_status, headers=headers
+        )
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
+
+    @action(
+        detail=False, methods=['get'],
+        url_path=r'requests/(?P<request_id>[0-9]+)', url_name='request-status',
+    )
+    def request_status(self, request, request_id):
+        """Idempotent / asenkron sipariş isteğinin durumu"""
+        order_request = get_object_or_404(OrderRequest, pk=request_id, owner=request.user)
+        return Response(OrderRequestSerializer(order_request).data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Siparişleri kalemleriyle birlikte CSV / JSONL / XLSX olarak akış halinde indir"""
+        params = OrderExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data.pop('type')
+        orders = iter_orders(export_queryset(request.user, **params.validated_data))
+
+        if output == 'xlsx':
+            try:
+                file = xlsx_file(orders)
+            except ImportError:
+                raise ValidationError({'type': ["XLSX dışa aktarma için openpyxl kurulu olmalı."]})
+            return FileResponse(file, as_attachment=True, filename='orders.xlsx')
+
+        if output == 'csv':
+            response = StreamingHttpResponse(csv_stream(orders), content_type='text/csv; charset=utf-8')
+        else:
+            response = StreamingHttpResponse(
+                jsonl_stream(orders), content_type='application/x-ndjson; charset=utf-8'
+            )
+        response['Content-Disposition'] = f'attachment; filename="orders.{output}"'
+        return response
@@ -0,0 +1,12 @@
+from dashboard_project.async_api import AsyncReadView
+from dashboard_project.filters import SearchQuerySerializer
+from .models import Product
+from .serializers import ProductSerializer
+
+
+class ProductAsyncView(AsyncReadView):
+    serializer_class = ProductSerializer
+    filter_serializer_class = SearchQuerySerializer
+
+    def get_queryset(self, user):
+        return Product.objects.filter(owner=user)
@@ -0,0 +1,196 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Upper
+from rest_framework.exceptions import ValidationError
+
+from dashboard_project.cache import invalidate_cached_responses
+from dashboard_project.streaming import Echo
+from .models import Product
+from .serializers import ProductImportSerializer
+
+EXPORT_FIELDS = ['code', 'name', 'price']
+
+
+def iter_rows(stream, content_type):
+    """
+    İstek gövdesini satır satır oku; CSV veya JSONL satırlarını sözlük olarak üret.
+
+    Gövde boşsa veya bir satır çözülemiyorsa (UTF-8 dışı kodlama, bozuk CSV)
+    satır numarasıyla ValidationError (400) yükseltilir. Geçersiz JSON
+    satırları ise import_products tarafından satır hatası olarak raporlanır.
+    """
+    if stream is None:
+        raise ValidationError({'body': ["İstek gövdesi boş."]})
+
+    lines = _decoded_lines(stream)
+    rows = csv.DictReader(lines) if 'csv' in content_type else _jsonl_rows(lines)
+    row_number = 0
+    try:
+        for row in rows:
+            row_number += 1
+            yield row
+    except UnicodeDecodeError:
+        raise ValidationError({'body': [f"{row_number + 1}. satır UTF-8 olarak okunamadı."]})
+    except csv.Error:
+        raise ValidationError({'body': [f"{row_number + 1}. satır geçerli bir CSV satırı değil."]})
+
+
+def _decoded_lines(stream):
+    # Satır satır çözülür; hata, hatalı satır okunurken yükselir
+    for number, line in enumerate(stream):
+        yield line.decode('utf-8-sig' if number == 0 else 'utf-8')
+
+
+def _jsonl_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except (ValueError, RecursionError):
+            row = None
+        yield row if isinstance(row, dict) else {'__invalid__': line}
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_products(user, rows, chunk_size=1000):
+    """
+    Ürünleri parça parça doğrula ve yaz.
+
+    Her parça için kod benzersizliği tek sorguyla kontrol edilir; yeni
+    ürünler bulk_create, kullanıcının mevcut ürünleri bulk_update ile yazılır.
+    Hatalı satırlar atlanır ve satır numarasıyla raporlanır.
+    """
+    result = {'created': 0, 'updated': 0, 'errors': []}
+    seen_codes = set()
+    row_number = 0
+
+    # Parçalar ayrı ayrı commit edilir; akışın ortasında hata çıksa da yazılan
+    # parçalar önbellekte eski haliyle kalmasın
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            valid = []
+            for row in chunk:
+                row_number += 1
+                if '__invalid__' in row:
+                    result['errors'].append(
+                        {'row': row_number, 'errors': ["Geçersiz JSON satırı."]}
+                    )
+                    continue
+
+                serializer = ProductImportSerializer(data=row)
+                if not serializer.is_valid():
+                    result['errors'].append({'row': row_number, 'errors': serializer.errors})
+                    continue
+
+                data = serializer.validated_data
+                if data['code'] in seen_codes:
+                    result['errors'].append({
+                        'row': row_number,
+                        'errors': {'code': ["Bu ürün kodu dosyada birden fazla kez geçiyor."]},
+                    })
+                    continue
+                seen_codes.add(data['code'])
+                valid.append((row_number, data))
+
+            if valid:
+                _write_chunk(user, valid, result)
+    finally:
+        if result['created'] or result['updated']:
+            invalidate_cached_responses('product', user.pk, all_objects=True)
+    result['errors'].sort(key=lambda error: error['row'])
+    return result
+
+
+def _existing_codes(codes):
+    """Büyük harfe çevrilmiş kod -> (pk, owner_id)"""
+    return {
+        code: (pk, owner_id)
+        for pk, owner_id, code in Product.objects.annotate(code_upper=Upper('code'))
+        .filter(code_upper__in=codes)
+        .values_list('pk', 'owner_id', 'code_upper')
+    }
+
+
+def _plan_chunk(user, valid):
+    existing = _existing_codes([data['code'] for _, data in valid])
+    errors = []
+    to_create = []
+    to_update = []
+    for row_number, data in valid:
+        match = existing.get(data['code'])
+        if match is not None and match[1] != user.pk:
+            errors.append({
+                'row': row_number,
+                'errors': {'code': ["Bu ürün kodu zaten kullanılıyor."]},
+            })
+            continue
+
+        if match is None:
+            product = Product(owner=user, **data)
+            to_create.append((row_number, product))
+        else:
+            product = Product(pk=match[0], **data)
+            to_update.append(product)
+        # bulk işlemler save() çağırmaz; arama sütununu burada doldur
+        product.refresh_search_text()
+    return errors, to_create, to_update
+
+
+def _write_chunk(user, valid, result, attempts=3):
+    """
+    Parçayı yaz. Parça okunduktan sonra başka bir istek aynı kodu eklemişse
+    IntegrityError alınır; kodlar yeniden sorgulanıp parça tekrar denenir.
+    """
+    for _ in range(attempts):
+        errors, to_create, to_update = _plan_chunk(user, valid)
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create([product for _, product in to_create])
+                Product.objects.bulk_update(to_update, ['name', 'price', 'search_text'])
+        except IntegrityError:
+            continue
+        result['errors'].extend(errors)
+        result['created'] += len(to_create)
+        result['updated'] += len(to_update)
+        return
+
+    # Çakışma sürüyorsa güncellemeleri yaz (kod değişmez, çakışamaz), yeni
+    # ürünleri hatalı say
+    with transaction.atomic():
+        Product.objects.bulk_update(to_update, ['name', 'price', 'search_text'])
+    result['errors'].extend(errors)
+    result['errors'].extend(
+        {'row': row_number, 'errors': {'code': ["Bu ürün kodu zaten kullanılıyor."]}}
+        for row_number, _ in to_create
+    )
+    result['updated'] += len(to_update)
+
+
+def export_rows(user, output, chunk_size=2000):
+    """Kullanıcının ürünlerini sabit bellekle CSV veya JSONL satırları olarak üret"""
+    products = (
+        Product.objects.filter(owner=user)
+        .order_by('id')
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    if output == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in products:
+            yield writer.writerow(row)
+    else:
+        for code, name, price in products:
+            yield json.dumps(
+                {'code': code, 'name': name, 'price': str(price)}, ensure_ascii=False
+            ) + '\n'
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:19
+
+from django.db import migrations, models
+
+from dashboard_project.search import normalize_search
+
+
+def fill_search_text(apps, schema_editor):
+    Product = apps.get_model('product', 'Product')
+    # Tablo belleğe tek seferde alınmaz; parça parça okunup yazılır
+    batch = []
+    for row in Product.objects.only('pk', 'code', 'name').iterator(chunk_size=1000):
+        row.search_text = normalize_search(f"{row.code} {row.name}")
+        batch.append(row)
+        if len(batch) >= 1000:
+            Product.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    Product.objects.bulk_update(batch, ['search_text'])
+
+
+def create_trigram_index(apps, schema_editor):
+    # Sadece PostgreSQL: LIKE '%...%' aramaları için pg_trgm GIN indeksi
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS product_search_trgm_idx "
+        "ON product_product USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS product_search_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0004_product_product_code_ci_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=320),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.db.models.functions import Upper
+from dashboard_project.search import normalize_search
 
 class Product(models.Model):
     code = models.CharField(max_length=50, unique=True)
@@ -7,6 +9,24 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Kod + isim; büyük/küçük harf ve aksan duyarsız arama için (bkz. normalize_search)
+    search_text = models.CharField(max_length=320, blank=True, default='', editable=False)
+
+    class Meta:
+        constraints = [
+            # Ürün kodları tüm sistemde büyük/küçük harf duyarsız benzersiz
+            models.UniqueConstraint(Upper('code'), name='product_code_ci_uniq'),
+        ]
 
     def __str__(self):
         return self.name
+
+    def refresh_search_text(self):
+        self.search_text = normalize_search(f"{self.code} {self.name}")
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'code', 'name'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
@@ -1,8 +1,13 @@
 from rest_framework import serializers
+from dashboard_project.serializers import IntegrityErrorMixin
 from .models import Product
 from decimal import Decimal
+from django.db.models import Value
+from django.db.models.functions import Upper
+
+class ProductSerializer(IntegrityErrorMixin, serializers.ModelSerializer):
+    integrity_error = {'code': ["Bu ürün kodu zaten kullanılıyor."]}
 
-class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ['id', 'name', 'code', 'price', 'created_at', 'owner']
@@ -23,6 +28,25 @@ class ProductSerializer(serializers.ModelSerializer):
 
     def validate_code(self, value):
         """Ürün kodu validasyonu"""
+        code = self._validate_code_format(value)
+
+        # Benzersizlik kontrolü (tüm sistemde unique)
+        # Upper(code) fonksiyonel indeksini kullanacak şekilde karşılaştır
+        existing = Product.objects.alias(code_upper=Upper('code')).filter(
+            code_upper=Upper(Value(code))
+        )
+        
+        # Update işleminde mevcut kaydı hariç tut
+        if self.instance:
+            existing = existing.exclude(pk=self.instance.pk)
+        
+        if existing.exists():
+            raise serializers.ValidationError("Bu ürün kodu zaten kullanılıyor.")
+        
+        return code
+
+    def _validate_code_format(self, value):
+        """Ürün kodu biçim kontrolü (veritabanına gitmez)"""
         if not value or not value.strip():
             raise serializers.ValidationError("Ürün kodu boş olamaz.")
         
@@ -38,16 +62,6 @@ class ProductSerializer(serializers.ModelSerializer):
         if len(value) > 50:
             raise serializers.ValidationError("Ürün kodu çok uzun (max 50 karakter).")
         
-        # Benzersizlik kontrolü (tüm sistemde unique)
-        existing = Product.objects.filter(code__iexact=value.strip())
-        
-        # Update işleminde mevcut kaydı hariç tut
-        if self.instance:
-            existing = existing.exclude(pk=self.instance.pk)
-        
-        if existing.exists():
-            raise serializers.ValidationError("Bu ürün kodu zaten kullanılıyor.")
-        
         return value.strip().upper()  # Kodları büyük harfe çevir
 
     def validate_price(self, value):
@@ -66,3 +80,19 @@ class ProductSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Fiyat en fazla 2 ondalık basamak içerebilir.")
         
         return value
+
+
+class ProductImportSerializer(ProductSerializer):
+    """
+    Toplu içe aktarma satırı.
+
+    Kod benzersizliği satır başına sorgulanmaz; product.bulk.import_products
+    her parça (chunk) için tek sorguyla kontrol eder.
+    """
+    class Meta(ProductSerializer.Meta):
+        fields = ['name', 'code', 'price']
+        # Model'deki unique=True satır başına sorgu ekler; toplu kontrol yeterli
+        extra_kwargs = {'code': {'validators': []}}
+
+    def validate_code(self, value):
+        return self._validate_code_format(value)
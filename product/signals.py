@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dashboard_project.cache import invalidate_cached_responses
+from .models import Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_responses(sender, instance, **kwargs):
+    """Önbellekteki liste ve detay yanıtlarını geçersiz kıl"""
+    invalidate_cached_responses('product', instance.owner_id, instance.pk)
@@ -1,3 +1,159 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from . import bulk
+from .models import Product
+
+User = get_user_model()
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, API_CACHE_TIMEOUT=300)
+class ProductResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+        self.product = Product.objects.create(
+            code='P-1', name='Ürün', price=Decimal('10.00'), owner=self.user
+        )
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get('/api/products/')
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/products/')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_request_returns_304(self):
+        etag = self.client.get('/api/products/').headers['ETag']
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_invalidate_list_and_detail(self):
+        detail_url = f'/api/products/{self.product.pk}/'
+        self.client.get('/api/products/')
+        self.client.get(detail_url)
+
+        response = self.client.patch(detail_url, {'name': 'Yeni İsim'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(detail_url).json()['name'], 'Yeni İsim')
+        self.assertEqual(self.client.get('/api/products/').json()['results'][0]['name'], 'Yeni İsim')
+
+        self.client.post(
+            '/api/products/', {'code': 'P-2', 'name': 'İkinci', 'price': '5.00'}, format='json'
+        )
+        self.assertEqual(len(self.client.get('/api/products/').json()['results']), 2)
+
+    def test_cache_is_per_owner(self):
+        self.client.get('/api/products/')
+        other = User.objects.create_user(username='other', password='Secret123!')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get('/api/products/').json()['results'], [])
+
+    def test_import_failing_midway_invalidates_written_chunks(self):
+        self.client.get('/api/products/')
+        body = 'code,name,price\nOK-1,Urun,1.00\nLAT-1,Ürün,1.00\n'.encode('latin-1')
+        with self.assertRaises(ValidationError):
+            bulk.import_products(self.user, bulk.iter_rows(BytesIO(body), 'text/csv'), chunk_size=1)
+        codes = [row['code'] for row in self.client.get('/api/products/').json()['results']]
+        self.assertIn('OK-1', codes)
+
+    @override_settings(API_CACHE_TIMEOUT=0)
+    def test_disabled_without_shared_cache(self):
+        self.client.get('/api/products/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ProductBulkTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        self.client.force_authenticate(self.user)
+        other = User.objects.create_user(username='other', password='Secret123!')
+        Product.objects.create(code='TAKEN', name='Başkası', price=Decimal('1.00'), owner=other)
+        Product.objects.create(code='OWN-1', name='Eski', price=Decimal('1.00'), owner=self.user)
+
+    def test_csv_import_reports_row_errors(self):
+        body = (
+            'code,name,price\n'
+            'new-1,Yeni Ürün,12.50\n'
+            'own-1,Güncel,3.00\n'
+            'taken,Çakışan,1.00\n'
+            'NEW-1,Tekrar,1.00\n'
+            'bad code,Geçersiz,1.00\n'
+        )
+        response = self.client.post('/api/products/bulk/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4, 5])
+
+        self.assertEqual(Product.objects.get(code='NEW-1').price, Decimal('12.50'))
+        self.assertEqual(Product.objects.get(code='OWN-1').name, 'Güncel')
+
+    def test_jsonl_import_checks_codes_once_per_chunk(self):
+        body = '\n'.join(
+            f'{{"code": "J-{i}", "name": "Ürün {i}", "price": "1.00"}}' for i in range(50)
+        ) + '\nnot json\n'
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                '/api/products/bulk/', body, content_type='application/x-ndjson'
+            )
+        self.assertEqual(response.data['created'], 50)
+        self.assertEqual(response.data['errors'], [{'row': 51, 'errors': ["Geçersiz JSON satırı."]}])
+
+    def test_concurrent_insert_only_fails_conflicting_row(self):
+        body = (
+            'code,name,price\n'
+            'own-1,Güncel,3.00\n'
+            'new-1,Yeni Ürün,12.50\n'
+            'taken,Çakışan,1.00\n'
+        )
+        # İlk denemede kodlar eski okunur: TAKEN henüz yokmuş gibi görünür
+        current = bulk._existing_codes(['OWN-1', 'NEW-1', 'TAKEN'])
+        with patch.object(bulk, '_existing_codes', side_effect=[{}, current]):
+            response = self.client.post('/api/products/bulk/', body, content_type='text/csv')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [3])
+        self.assertEqual(Product.objects.get(code='OWN-1').name, 'Güncel')
+        self.assertTrue(Product.objects.filter(code='NEW-1').exists())
+
+    def test_undecodable_body_is_rejected(self):
+        response = self.client.post('/api/products/bulk/', b'', content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['body'], ["İstek gövdesi boş."])
+
+        body = 'code,name,price\nOK-1,Urun,1.00\nLAT-1,Ürün,1.00\n'.encode('latin-1')
+        response = self.client.post('/api/products/bulk/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['body'], ["2. satır UTF-8 olarak okunamadı."])
+
+        body = '{"code": "J-1", "name": "Ürün", "price": "1.00"}\n'.encode('latin-1')
+        response = self.client.post(
+            '/api/products/bulk/', body, content_type='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['body'], ["1. satır UTF-8 olarak okunamadı."])
+
+    def test_export_streams_own_products(self):
+        response = self.client.get('/api/products/bulk/')
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.splitlines(), ['code,name,price', 'OWN-1,Eski,1.00'])
+
+        response = self.client.get('/api/products/bulk/?type=jsonl')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines, ['{"code": "OWN-1", "name": "Eski", "price": "1.00"}'])
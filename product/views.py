@@ -1,13 +1,43 @@
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from dashboard_project.cache import CachedResponseMixin
+from dashboard_project.filters import QueryParamFilterBackend, SearchQuerySerializer
 from .models import Product
 from .serializers import ProductSerializer
+from .bulk import export_rows, import_products, iter_rows
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'product'
+    filter_backends = [QueryParamFilterBackend]
+    filter_serializer_class = SearchQuerySerializer
 
     def get_queryset(self):
         return Product.objects.filter(owner=self.request.user)
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_import(self, request):
+        """CSV (text/csv) veya JSONL (application/x-ndjson) gövdesinden toplu ürün yükleme"""
+        rows = iter_rows(request.stream, request.content_type)
+        return Response(import_products(request.user, rows))
+
+    @bulk_import.mapping.get
+    def bulk_export(self, request):
+        """Ürünleri ?type=csv (varsayılan) veya ?type=jsonl olarak akış halinde indir"""
+        output = request.query_params.get('type', 'csv')
+        if output not in ('csv', 'jsonl'):
+            raise ValidationError({'type': ["Desteklenen türler: csv, jsonl."]})
+
+        content_type = 'text/csv' if output == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(
+            export_rows(request.user, output), content_type=f'{content_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="products.{output}"'
+        return response
@@ -0,0 +1,106 @@
+"""
+Maliyeti ayarlanabilir şifre hasher'ları ve isteğe bağlı thread havuzu.
+
+Hangi hasher'ın yeni şifreler için kullanılacağı PASSWORD_HASHER ayarıyla
+seçilir (bkz. settings.py); listedeki diğerleri eski hash'leri doğrulamak
+için kalır ve Django başarılı girişte şifreyi seçili algoritmaya taşır.
+
+PASSWORD_HASH_THREADS > 0 iken hash hesaplamaları süreç başına sabit
+boyutlu bir havuzda çalışır. Böylece bir giriş patlamasında aynı anda en
+fazla bu kadar hash hesaplanır; diğer thread'lerdeki istekler CPU bulmaya
+devam eder. Havuz PASSWORD_HASH_QUEUE_TIMEOUT saniye içinde işi
+bitiremezse istek 503 ile reddedilir.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin."
+    default_code = 'password_hashing_busy'
+
+
+def _executor(size):
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != size:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix='password-hash')
+            _pool_size = size
+        return _pool
+
+
+def _run_marked(func, args, kwargs):
+    _local.offloaded = True
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _local.offloaded = False
+
+
+def offload(func, *args, **kwargs):
+    """`func(*args, **kwargs)` çağrısını hash havuzunda çalıştır (havuz kapalıysa yerinde)"""
+    size = getattr(settings, 'PASSWORD_HASH_THREADS', 0)
+    # verify() içeriden encode() çağırır; havuz thread'inde tekrar kuyruğa girmesin
+    if size <= 0 or getattr(_local, 'offloaded', False):
+        return func(*args, **kwargs)
+    future = _executor(size).submit(_run_marked, func, args, kwargs)
+    try:
+        return future.result(timeout=getattr(settings, 'PASSWORD_HASH_QUEUE_TIMEOUT', 10))
+    except TimeoutError:
+        future.cancel()
+        raise PasswordHashingBusy()
+
+
+class OffloadedHasherMixin:
+    def encode(self, password, salt, *args, **kwargs):
+        return offload(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return offload(super().verify, password, encoded)
+
+    def harden_runtime(self, password, encoded):
+        return offload(super().harden_runtime, password, encoded)
+
+
+class PBKDF2PasswordHasher(OffloadedHasherMixin, hashers.PBKDF2PasswordHasher):
+    pass
+
+
+class PBKDF2SHA1PasswordHasher(OffloadedHasherMixin, hashers.PBKDF2SHA1PasswordHasher):
+    pass
+
+
+class Argon2PasswordHasher(OffloadedHasherMixin, hashers.Argon2PasswordHasher):
+    """
+    Django varsayılanı (102400 KiB, 8 lane) her hash için 100 MiB bellek
+    ister; eşzamanlı girişlerde bellek baskısı yaratır. Varsayılanlar OWASP
+    önerisidir (19 MiB, t=2, p=1) ve ARGON2_* ayarlarıyla değiştirilebilir.
+    """
+
+    def __init__(self):
+        self.time_cost = getattr(settings, 'ARGON2_TIME_COST', 2)
+        self.memory_cost = getattr(settings, 'ARGON2_MEMORY_COST', 19456)
+        self.parallelism = getattr(settings, 'ARGON2_PARALLELISM', 1)
+
+
+class BCryptSHA256PasswordHasher(OffloadedHasherMixin, hashers.BCryptSHA256PasswordHasher):
+    def __init__(self):
+        self.rounds = getattr(settings, 'BCRYPT_ROUNDS', 12)
+
+
+class ScryptPasswordHasher(OffloadedHasherMixin, hashers.ScryptPasswordHasher):
+    pass
+
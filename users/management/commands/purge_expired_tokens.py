@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from users.tokens import purge_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Süresi dolmuş refresh token kayıtlarını (outstanding ve kara liste) "
+        "parça parça siler. Cron ile veya --interval ile sürekli çalıştırılabilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Bu kadar saniyede bir tekrarla (0: bir kez çalışıp çık)",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size en az 1 olmalı.")
+
+        try:
+            while True:
+                close_old_connections()
+                deleted = purge_expired(options['batch_size'])
+                self.stdout.write(f"{deleted} süresi dolmuş token silindi.")
+                if not options['interval']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    token_blacklist uygulamasının outstanding tablosunda expires_at indeksi yok;
+    purge_expired_tokens her çalışmada tabloyu baştan sona tarardı.
+    """
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS token_outstanding_expires_idx '
+            'ON token_blacklist_outstandingtoken (expires_at)',
+            reverse_sql='DROP INDEX IF EXISTS token_outstanding_expires_idx',
+        ),
+    ]
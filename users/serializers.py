@@ -4,6 +4,16 @@ import re
 
 User = get_user_model()
 
+USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# Şifre kuralları modül yüklenirken bir kez derlenir
+PASSWORD_RULES = (
+    (re.compile(r'[A-Z]'), "Şifre en az bir büyük harf içermelidir."),
+    (re.compile(r'[a-z]'), "Şifre en az bir küçük harf içermelidir."),
+    (re.compile(r'[0-9]'), "Şifre en az bir rakam içermelidir."),
+    (re.compile(r'[!@#$%^&*(),.?":{}|<>]'), "Şifre en az bir özel karakter içermelidir (!@#$%^&* vb.)."),
+)
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8, max_length=128)
     password_confirm = serializers.CharField(write_only=True, required=False)
@@ -26,7 +36,7 @@ class RegisterSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Kullanıcı adı çok uzun (max 150 karakter).")
         
         # Sadece alfanumerik, alt çizgi ve tire
-        if not re.match(r'^[a-zA-Z0-9_-]+$', value):
+        if not USERNAME_RE.match(value):
             raise serializers.ValidationError(
                 "Kullanıcı adı sadece harf, rakam, alt çizgi (_) ve tire (-) içerebilir."
             )
@@ -42,21 +52,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         if len(value) < 8:
             raise serializers.ValidationError("Şifre en az 8 karakter olmalıdır.")
         
-        # En az bir büyük harf
-        if not re.search(r'[A-Z]', value):
-            raise serializers.ValidationError("Şifre en az bir büyük harf içermelidir.")
-        
-        # En az bir küçük harf
-        if not re.search(r'[a-z]', value):
-            raise serializers.ValidationError("Şifre en az bir küçük harf içermelidir.")
-        
-        # En az bir rakam
-        if not re.search(r'[0-9]', value):
-            raise serializers.ValidationError("Şifre en az bir rakam içermelidir.")
-        
-        # En az bir özel karakter
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', value):
-            raise serializers.ValidationError("Şifre en az bir özel karakter içermelidir (!@#$%^&* vb.).")
+        for pattern, message in PASSWORD_RULES:
+            if not pattern.search(value):
+                raise serializers.ValidationError(message)
         
         return value
 
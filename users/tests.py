@@ -1,3 +1,132 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import hashers
+from .authentication import user_cache
+from .tokens import RefreshToken
+
+User = get_user_model()
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        cache.clear()
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.client.get('/api/orders/').status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/orders/').status_code, 401)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class PasswordHashingTests(APITestCase):
+    def test_register_validates_password_rules(self):
+        response = self.client.post(
+            '/api/register/', {'username': 'tester', 'password': 'secret123!'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['password'], ["Şifre en az bir büyük harf içermelidir."])
+
+    @override_settings(PASSWORD_HASH_THREADS=2)
+    def test_offloaded_hashing(self):
+        response = self.client.post(
+            '/api/register/', {'username': 'tester', 'password': 'Secret123!'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(username='tester').password.startswith('pbkdf2_sha256$'))
+
+        response = self.client.post(
+            '/api/token/', {'username': 'tester', 'password': 'Secret123!'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+
+    @override_settings(PASSWORD_HASH_THREADS=1, PASSWORD_HASH_QUEUE_TIMEOUT=0.01)
+    def test_busy_pool_returns_503(self):
+        release = threading.Event()
+        hashers._executor(1).submit(release.wait, 5)
+        try:
+            response = self.client.post(
+                '/api/register/', {'username': 'tester', 'password': 'Secret123!'}, format='json'
+            )
+        finally:
+            release.set()
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(User.objects.filter(username='tester').exists())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TokenBlacklistTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='tester', password='Secret123!')
+
+    def test_rotated_refresh_token_is_rejected(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        with self.assertNumQueries(6), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['refresh'], refresh)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+
+        # Önbellekten reddedilir (yalnızca transaction savepoint'leri çalışır)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse([q for q in queries.captured_queries if 'token_blacklist' in q['sql']])
+
+        # Önbellek boşken veritabanından
+        cache.clear()
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_issued_before_blacklist_can_rotate(self):
+        refresh = RefreshToken.for_user(self.user)
+        OutstandingToken.objects.all().delete()
+        response = self.client.post(
+            '/api/token/refresh/', {'refresh': str(refresh)}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=refresh['jti']).exists())
+
+    def test_purge_expired(self):
+        RefreshToken.for_user(self.user).blacklist()
+        live = RefreshToken.for_user(self.user)
+        OutstandingToken.objects.exclude(jti=live['jti']).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        RefreshToken.for_user(self.user)
+        OutstandingToken.objects.exclude(jti=live['jti']).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command('purge_expired_tokens', '--batch-size', '1', stdout=out)
+        self.assertIn('2 süresi dolmuş token silindi.', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [live['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,126 @@
+"""
+Refresh token kara listesi için daha az sorgulu token sınıfı.
+
+simplejwt'nin varsayılanı her /api/token/refresh/ çağrısında kullanıcıyı
+üç kez okur; kara liste kontrolü ve iki get_or_create ile birlikte on bir
+sorgu ve iki ayrı transaction çalıştırır. Burada:
+
+- kara liste kontrolü ve outstanding kaydı tek sorguda (jti unique indeksi
+  üzerinden) okunur,
+- kara listeye ekleme ve yeni token kaydı birer INSERT'tür ve aynı
+  transaction'da yazılır,
+- kara listeye alınan jti'ler token süresi dolana kadar önbellekte tutulur;
+  döndürülmüş bir token'ın tekrar kullanımı veritabanına gitmeden reddedilir.
+
+Süresi dolan kayıtlar `manage.py purge_expired_tokens` ile silinir.
+"""
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers, tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+
+def _cache_key(jti):
+    return f'jwt-blacklist:{jti}'
+
+
+def _remember_blacklisted(jti, exp):
+    remaining = int((datetime_from_epoch(exp) - aware_utcnow()).total_seconds())
+    if remaining > 0:
+        cache.set(_cache_key(jti), True, remaining)
+
+
+class RefreshToken(tokens.RefreshToken):
+    _outstanding = None
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if cache.get(_cache_key(jti)):
+            raise TokenError(_("Token is blacklisted"))
+
+        row = (
+            OutstandingToken.objects.filter(jti=jti)
+            .order_by()
+            .values_list('id', F('blacklistedtoken__id'))
+            .first()
+        )
+        if row is not None and row[1] is not None:
+            _remember_blacklisted(jti, self.payload['exp'])
+            raise TokenError(_("Token is blacklisted"))
+        # blacklist() aynı kaydı tekrar okumasın
+        self._outstanding = row
+
+    def blacklist(self):
+        if self._outstanding is None:
+            # Kara liste uygulaması açılmadan önce verilmiş token; kayıt yok
+            result = super().blacklist()
+        else:
+            BlacklistedToken.objects.bulk_create(
+                [BlacklistedToken(token_id=self._outstanding[0])], ignore_conflicts=True
+            )
+            result = None
+        # Geri alınan bir işlemde token önbellekte kara listede kalmasın. Rotasyonda
+        # commit'ten önce jti / exp yenisiyle değişir; değerler şimdi alınır.
+        transaction.on_commit(partial(
+            _remember_blacklisted, self.payload[api_settings.JTI_CLAIM], self.payload['exp']
+        ))
+        return result
+
+    def outstand(self):
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(
+                user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+                jti=self.payload[api_settings.JTI_CLAIM],
+                token=str(self),
+                created_at=self.current_time,
+                expires_at=datetime_from_epoch(self.payload['exp']),
+            )
+        ], ignore_conflicts=True)
+        self._outstanding = None
+
+
+class TokenObtainPairSerializer(serializers.TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+
+class TokenRefreshSerializer(serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        # Eski token'ın kara listeye alınması ile yenisinin kaydı birlikte yazılır
+        with transaction.atomic():
+            return super().validate(attrs)
+
+
+class TokenBlacklistSerializer(serializers.TokenBlacklistSerializer):
+    token_class = RefreshToken
+
+
+def purge_expired(batch_size=1000):
+    """
+    Süresi dolmuş outstanding / kara liste kayıtlarını parça parça sil.
+
+    Süresi dolan token imza doğrulamasında zaten reddedilir; kaydının
+    silinmesi güvenliği etkilemez. Her parça ayrı kısa bir sorgudur, büyük
+    tek bir DELETE tabloyu uzun süre kilitlemez. Silinen kayıt sayısını döner.
+    """
+    now = aware_utcnow()
+    deleted = 0
+    while True:
+        # Model varsayılan sıralaması (user) indeksi kullanmayı engeller
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by()
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        deleted += OutstandingToken.objects.filter(id__in=ids).order_by().delete()[0]